@@ -1,29 +1,62 @@
 from flask import Flask
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 import logging
 
-from app.extensions import db, migrate, jwt
+from app.extensions import db, migrate, jwt, bcrypt
 from app.routes import register_routes
+from app.commands import register_commands
+from app.utils.pagination import CursorError
+from app.utils.auth import register_user_loader
+from app.utils.compression import register_compression
+from app.utils.json_provider import FastJSONProvider
+from app.utils.metrics import configure_pool, register_metrics
+from app.utils.instrumentation import register_instrumentation
+from app.utils.log import configure_logging
+from app.utils.passwords import PasswordBusy
+from app.utils.ratelimit import configure_login_limits
+from app.utils.replicas import register_replicas
 
 def create_app():
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
 
     app.config.from_object('config.Config')
+    if app.config['PROXY_FIX_X_FOR'] or app.config['PROXY_FIX_X_PROTO']:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'],
+                                x_proto=app.config['PROXY_FIX_X_PROTO'])
 
-    logging.basicConfig(level=logging.INFO)
+    configure_logging(app)
     logger = logging.getLogger(__name__)
     logger.info("Starting Flask application")
 
-    CORS(app)
+    CORS(app, expose_headers=['X-Next-Cursor', 'X-Total-Count', 'Server-Timing'], supports_credentials=True)
+    configure_pool(app)
     db.init_app(app)
+    register_replicas(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+    register_user_loader(jwt)
+    bcrypt.init_app(app)
+    configure_login_limits(app)
 
     with app.app_context():
         from app import models
 
     # Реєстрація маршрутів
     register_routes(app)
+    register_commands(app)
+    register_instrumentation(app)
+    register_compression(app)
+    register_metrics(app)
+
+    @app.errorhandler(CursorError)
+    def handle_cursor_error(e):
+        return {"msg": str(e)}, 400
+
+    @app.errorhandler(PasswordBusy)
+    def handle_password_busy(e):
+        return {"msg": "Server is busy, try again later."}, 503, {'Retry-After': '1'}
 
     # Маршрут для головної сторінки
     @app.route('/', methods=['GET'])
@@ -0,0 +1,104 @@
+import sys
+from datetime import date, datetime, timedelta
+
+import click
+from flask import current_app
+
+from app.extensions import db
+from app.models import Rental, Asset, StatusHistory, FinancialSummary
+from app.utils.booking import overlapping_rentals
+from app.utils.finance import reconcile_summaries
+from app.utils.audit import compact
+
+
+def hot_queries():
+    """
+    Запити гарячих ендпоінтів, які повинні йти через індекс.
+    """
+    return {
+        'dashboard: active rentals': Rental.query.filter_by(user_id=1, status='Активний'),
+        'objects: available assets': Asset.query.filter_by(status='Доступно'),
+        'objects: catalog by type and price': Asset.query.filter(
+            Asset.type == 'Автомобілі', Asset.price_per_day <= 100
+        ),
+        'status_history: asset timeline': StatusHistory.query
+            .filter(StatusHistory.asset_id == 1)
+            .order_by(StatusHistory.changed_at),
+        'status_history: owner listing': StatusHistory.query
+            .join(Asset, StatusHistory.asset_id == Asset.id)
+            .filter(Asset.user_id == 1)
+            .order_by(StatusHistory.changed_at, StatusHistory.id),
+        'rentals: booking overlap check': overlapping_rentals([1], date(2024, 1, 1), date(2024, 1, 5)),
+        'rentals: financial summary lookup': FinancialSummary.query
+            .filter_by(user_id=1, period_start=date(2024, 1, 1)),
+    }
+
+
+def _explain(query):
+    dialect = db.engine.dialect
+    sql = str(query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == 'sqlite':
+        rows = db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        plan = [row[-1] for row in rows]
+        # "SCAN rentals" без "USING ... INDEX" — повний перебір таблиці
+        full_scan = any(line.startswith('SCAN') and 'INDEX' not in line for line in plan)
+    else:
+        rows = db.session.execute(db.text(f"EXPLAIN {sql}")).mappings().all()
+        plan = [f"{row['table']}: type={row['type']} possible_keys={row['possible_keys']} key={row['key']}"
+                for row in rows]
+        # На малих таблицях MySQL обирає ALL навіть за наявності індексу, тож
+        # помилкою вважається лише перебір, для якого індексу немає взагалі
+        full_scan = any(row['type'] == 'ALL' and not row['possible_keys'] for row in rows)
+    return plan, full_scan
+
+
+def query_plans():
+    """
+    (назва, план, повний перебір?) для кожного гарячого запиту.
+    """
+    return [(name, *_explain(query)) for name, query in hot_queries().items()]
+
+
+def check_query_plans():
+    """
+    Повертає список (назва, план) для запитів, що впали у повний перебір.
+    """
+    return [(name, plan) for name, plan, full_scan in query_plans() if full_scan]
+
+
+def register_commands(app):
+    @app.cli.command('explain-hot-queries')
+    def explain_hot_queries():
+        """Перевірити плани гарячих запитів на повний перебір таблиць."""
+        failures = 0
+        for name, plan, full_scan in query_plans():
+            failures += full_scan
+            click.echo(f"{'FULL SCAN' if full_scan else 'ok':9} {name}")
+            for line in plan:
+                click.echo(f"          {line}")
+
+        if failures:
+            current_app.logger.error("%s hot queries fall back to a full scan", failures)
+            sys.exit(1)
+
+    @app.cli.command('reconcile-summaries')
+    @click.option('--fix', is_flag=True, help='Переписати розбіжні підсумки значеннями з rentals.')
+    def reconcile_summaries_command(fix):
+        """Звірити financial_summaries з таблицею rentals."""
+        drift = reconcile_summaries(fix=fix)
+        for user_id, period_start, (have_rentals, have_cost), (want_rentals, want_cost) in drift:
+            click.echo(f"user {user_id} {period_start}: rentals {have_rentals} -> {want_rentals}, "
+                       f"cost {have_cost:.2f} -> {want_cost:.2f}")
+        click.echo(f"{len(drift)} summaries {'fixed' if fix else 'drifted'}")
+        if drift and not fix:
+            sys.exit(1)
+
+    @app.cli.command('compact-audit')
+    @click.option('--days', type=int, default=None, help='Термін зберігання живих записів (AUDIT_RETENTION_DAYS).')
+    @click.option('--batch-size', type=int, default=10000)
+    def compact_audit(days, batch_size):
+        """Згорнути старі записи журналу змін у стиснуті архіви."""
+        days = days if days is not None else current_app.config['AUDIT_RETENTION_DAYS']
+        before = datetime.utcnow() - timedelta(days=days)
+        for source, count in compact(before, batch_size).items():
+            click.echo(f"{source}: {count} rows archived (older than {before:%Y-%m-%d})")
@@ -1,5 +1,5 @@
 from app.extensions import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.utils.passwords import hash_password, verify_password
 from datetime import datetime
 
 class User(db.Model):
@@ -16,10 +16,10 @@ class User(db.Model):
     assets = db.relationship('Asset', back_populates='user', lazy='dynamic')
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
 
 
 class FinancialSummary(db.Model):
@@ -35,6 +35,10 @@ class FinancialSummary(db.Model):
 
     user = db.relationship('User', back_populates='financial_summaries')
 
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'period_start', name='uq_financial_summaries_user_id_period_start'),
+    )
+
 
 class Asset(db.Model):
     __tablename__ = 'assets'
@@ -53,6 +57,14 @@ class Asset(db.Model):
     rentals = db.relationship('Rental', back_populates='asset', lazy='dynamic')
     status_histories = db.relationship('StatusHistory', back_populates='asset', lazy='dynamic')
 
+    __table_args__ = (
+        db.Index('ix_assets_status_type_price', 'status', 'type', 'price_per_day'),
+        db.Index('ix_assets_type_price', 'type', 'price_per_day'),
+        # FULLTEXT є лише в MySQL; на інших БД це був би звичайний індекс, який пошук не використовує
+        db.Index('ix_assets_name_description_fulltext', 'name', 'description',
+                 mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
+
 
 class Rental(db.Model):
     __tablename__ = 'rentals'
@@ -69,6 +81,11 @@ class Rental(db.Model):
     asset = db.relationship('Asset', back_populates='rentals')
     rental_histories = db.relationship('RentalHistory', back_populates='rental', lazy='dynamic')
 
+    __table_args__ = (
+        db.Index('ix_rentals_user_id_status', 'user_id', 'status'),
+        db.Index('ix_rentals_asset_id_status_dates', 'asset_id', 'status', 'rental_date', 'end_date'),
+    )
+
 
 class StatusHistory(db.Model):
     __tablename__ = 'status_histories'
@@ -81,6 +98,10 @@ class StatusHistory(db.Model):
 
     asset = db.relationship('Asset', back_populates='status_histories')
 
+    __table_args__ = (
+        db.Index('ix_status_histories_asset_id_changed_at', 'asset_id', 'changed_at'),
+    )
+
 
 class RentalHistory(db.Model):
     __tablename__ = 'rental_histories'
@@ -92,3 +113,44 @@ class RentalHistory(db.Model):
     changed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
     rental = db.relationship('Rental', back_populates='rental_histories')
+
+    __table_args__ = (
+        db.Index('ix_rental_histories_rental_id_changed_at', 'rental_id', 'changed_at'),
+    )
+
+
+class AuditArchive(db.Model):
+    """
+    Стиснуті записи історії, старші за термін зберігання: один рядок — частина
+    історії одного об'єкта/оренди за місяць (zlib-стиснутий JSON).
+    """
+    __tablename__ = 'audit_archives'
+
+    id = db.Column(db.Integer, primary_key=True)
+    source = db.Column(db.String(50), nullable=False)
+    key_id = db.Column(db.Integer, nullable=False)
+    period_start = db.Column(db.Date, nullable=False)
+    first_id = db.Column(db.Integer, nullable=False)
+    last_id = db.Column(db.Integer, nullable=False)
+    first_changed_at = db.Column(db.DateTime, nullable=False)
+    last_changed_at = db.Column(db.DateTime, nullable=False)
+    row_count = db.Column(db.Integer, nullable=False)
+    payload = db.Column(db.LargeBinary(length=2 ** 24), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_audit_archives_source_key_id_changed_at', 'source', 'key_id', 'first_changed_at'),
+    )
+
+
+
+class TableVersion(db.Model):
+    """
+    Версія таблиці: збільшується після кожного commit, що змінив її рядки.
+    Спільна для всіх воркерів, тож нею валідуються умовні GET і ключі кешу.
+    """
+    __tablename__ = 'table_versions'
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
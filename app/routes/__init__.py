@@ -1,23 +1,10 @@
 from .auth import auth_bp
-print("Imported auth_bp")
-
 from .dashboard import dashboard_bp
-print("Imported dashboard_bp")
-
 from .financial_summary import financial_summary_bp
-print("Imported financial_summary_bp")
-
 from .objects import objects_bp
-print("Imported objects_bp")
-
 from .rentals import rentals_bp
-print("Imported rentals_bp")
-
 from .status_history import status_history_bp
-print("Imported status_history_bp")
-
 from .users import users_bp
-print("Imported users_bp")
 
 
 def register_routes(app):
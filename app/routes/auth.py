@@ -1,13 +1,17 @@
 from flask import Blueprint, request, jsonify
 from app.models import db, User
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from app.utils.serializers import dump_user
+from app.utils.conditional import conditional
+from app.utils.passwords import PasswordBusy, needs_rehash
+from app.utils.ratelimit import login_retry_after, login_succeeded
+from flask_jwt_extended import create_access_token, jwt_required, current_user
 from datetime import timedelta
 import logging
+import math
 
 auth_bp = Blueprint('auth', __name__)
 
 # Налаштування логування
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 @auth_bp.route('/register', methods=['POST'])
@@ -30,10 +34,10 @@ def register():
     existing_user = User.query.filter((User.username == username) | (User.email == email)).first()
     if existing_user:
         if existing_user.username == username:
-            logger.warning(f"Registration attempt with existing username: {username}")
+            logger.warning("Registration attempt with existing username: %s", username)
             return jsonify({"msg": "Username already exists."}), 409
         else:
-            logger.warning(f"Registration attempt with existing email: {email}")
+            logger.warning("Registration attempt with existing email: %s", email)
             return jsonify({"msg": "Email already exists."}), 409
 
     # Створення нового користувача
@@ -47,7 +51,7 @@ def register():
     try:
         db.session.add(new_user)
         db.session.commit()
-        logger.info(f"User registered successfully: {username}")
+        logger.info("User registered successfully: %s", username)
 
         # Створення токена доступу
         access_token = create_access_token(identity=str(new_user.id), expires_delta=timedelta(hours=1))
@@ -58,14 +62,13 @@ def register():
         }), 201
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error during registration: {str(e)}")
+        logger.error("Error during registration: %s", e)
         return jsonify({"msg": "Internal server error."}), 500
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
     try:
         data = request.get_json()
-        logger.info(f"Received login data: {data}")
 
         if not data:
             logger.warning("No input data provided for login")
@@ -74,58 +77,67 @@ def login():
         username = data.get('username')
         password = data.get('password')
 
-        logger.info(f"Attempting login for user: {username}")
+        logger.debug("Attempting login for user: %s", username)
 
         if not username or not password:
             logger.warning("Missing username or password")
             return jsonify({"msg": "Username and password are required."}), 400
 
+        if not isinstance(username, str) or not isinstance(password, str):
+            logger.warning("Non-string username or password in login request")
+            return jsonify({"msg": "Invalid credentials."}), 401
+
+        # Ліміт перевіряється до запиту в БД і до хешування
+        retry_after = login_retry_after(username, request.remote_addr or '')
+        if retry_after:
+            logger.warning("Too many login attempts for user: %s from %s", username, request.remote_addr)
+            return jsonify({"msg": "Too many login attempts."}), 429, {'Retry-After': str(math.ceil(retry_after))}
+
         user = User.query.filter_by(username=username).first()
 
         if not user:
-            logger.warning(f"User not found: {username}")
+            logger.warning("User not found: %s", username)
             return jsonify({"msg": "Invalid credentials."}), 401
 
         if not user.check_password(password):
-            logger.warning(f"Password mismatch for user: {username}")
+            logger.warning("Password mismatch for user: %s", username)
             return jsonify({"msg": "Invalid credentials."}), 401
 
+        # Пароль відомий лише зараз: хеш зі старими параметрами замінюється новим
+        if needs_rehash(user.password_hash):
+            try:
+                user.set_password(password)
+                db.session.commit()
+                logger.info("Password rehashed for user: %s", username)
+            except PasswordBusy:
+                db.session.rollback()
+            except Exception as e:
+                db.session.rollback()
+                logger.error("Error rehashing password for user %s: %s", username, e)
+
         # Створення токена доступу з рядком user_id
         access_token = create_access_token(identity=str(user.id), expires_delta=timedelta(hours=1))
-        logger.info(f"Login successful for user: {username}")
+        login_succeeded(username, request.remote_addr or '')
+        logger.info("Login successful for user: %s", username)
         return jsonify({"access_token": access_token}), 200
 
+    except PasswordBusy:
+        raise
     except Exception as e:
-        logger.error(f"Error during login: {str(e)}")
+        logger.error("Error during login: %s", e)
         return jsonify({"msg": "Internal server error."}), 500
 
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
+@conditional('users')
 def me():
     try:
-        user_id = get_jwt_identity()
-        logger.info(f"Fetching user profile for user ID: {user_id}")
-
-        try:
-            user_id = int(user_id)
-        except ValueError:
-            logger.error(f"Invalid user ID type: {user_id}")
-            return jsonify({"msg": "Invalid token."}), 422
+        user = current_user
 
-        user = User.query.get(user_id)
-        if not user:
-            logger.warning(f"User not found with ID: {user_id}")
-            return jsonify({"msg": "User not found."}), 404
-
-        user_data = {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "is_admin": user.is_admin  # Додано поле is_admin
-        }
-        logger.info(f"User profile retrieved: {user_data}")
+        user_data = dump_user(user)
+        logger.debug("User profile retrieved for user ID: %s", user.id)
         return jsonify(user_data), 200
 
     except Exception as e:
-        logger.error(f"Error fetching user profile: {str(e)}")
+        logger.error("Error fetching user profile: %s", e)
         return jsonify({"msg": "Internal server error."}), 500
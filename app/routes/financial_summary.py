@@ -1,15 +1,19 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 from app.extensions import db
+from sqlalchemy.exc import IntegrityError
 from app.models import FinancialSummary
-from datetime import datetime
+from app.utils.serializers import financial_summary_rows, dump_financial_summary
+from app.utils.conditional import conditional
+from app.utils.reports import financial_report, ReportError
+from datetime import datetime, date
 
 financial_summary_bp = Blueprint('financial_summary', __name__)
 
 @financial_summary_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_summary():
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     data = request.get_json()
 
     period_start = data.get('period_start')
@@ -34,52 +38,67 @@ def create_summary():
         total_cost=total_cost
     )
 
-    db.session.add(new_summary)
-    db.session.commit()
+    try:
+        db.session.add(new_summary)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"msg": "Summary for this period already exists"}), 409
 
     return jsonify({"msg": "Financial summary created successfully"}), 201
 
 @financial_summary_bp.route('/<int:summary_id>', methods=['GET'])
 @jwt_required()
+@conditional('financial_summaries')
 def get_summary(summary_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     summary = FinancialSummary.query.filter_by(id=summary_id, user_id=user_id).first()
 
     if not summary:
         return jsonify({"msg": "Summary not found"}), 404
 
-    summary_data = {
-        "id": summary.id,
-        "user_id": summary.user_id,
-        "period_start": summary.period_start.isoformat(),
-        "period_end": summary.period_end.isoformat(),
-        "total_rentals": summary.total_rentals,
-        "total_cost": float(summary.total_cost),
-        "created_at": summary.created_at.isoformat()
-    }
+    summary_data = dump_financial_summary(summary)
 
     return jsonify(summary_data), 200
 
 @financial_summary_bp.route('/', methods=['GET'])
 @jwt_required()
+@conditional('financial_summaries')
 def get_all_summaries():
-    user_id = get_jwt_identity()
-    summaries = FinancialSummary.query.filter_by(user_id=user_id).all()
-    summaries_data = [{
-        "id": summary.id,
-        "period_start": summary.period_start.isoformat(),
-        "period_end": summary.period_end.isoformat(),
-        "total_rentals": summary.total_rentals,
-        "total_cost": float(summary.total_cost),
-        "created_at": summary.created_at.isoformat()
-    } for summary in summaries]
+    user_id = current_user.id
+    summaries = financial_summary_rows(FinancialSummary.query.filter_by(user_id=user_id)).all()
+    summaries_data = [dump_financial_summary(row) for row in summaries]
 
     return jsonify(summaries_data), 200
 
+@financial_summary_bp.route('/report', methods=['GET'])
+@jwt_required()
+@conditional('rentals', 'assets')
+def get_report():
+    """
+    Звіт по оренді користувача: ?granularity=day|week|month&from=YYYY-MM-DD&to=YYYY-MM-DD.
+    За замовчуванням — помісячно з початку поточного року до сьогодні.
+    """
+    granularity = request.args.get('granularity', 'month')
+    today = date.today()
+
+    try:
+        start = datetime.strptime(request.args['from'], '%Y-%m-%d').date() if request.args.get('from') else date(today.year, 1, 1)
+        end = datetime.strptime(request.args['to'], '%Y-%m-%d').date() if request.args.get('to') else today
+    except ValueError:
+        return jsonify({"msg": "Invalid date format. Use YYYY-MM-DD."}), 400
+
+    try:
+        report = financial_report(current_user.id, granularity, start, end, today=today)
+    except ReportError as e:
+        return jsonify({"msg": str(e)}), 400
+
+    return jsonify(report), 200
+
 @financial_summary_bp.route('/<int:summary_id>', methods=['PUT'])
 @jwt_required()
 def update_summary(summary_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     summary = FinancialSummary.query.filter_by(id=summary_id, user_id=user_id).first()
 
     if not summary:
@@ -110,14 +129,18 @@ def update_summary(summary_id):
     if total_cost is not None:
         summary.total_cost = total_cost
 
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"msg": "Summary for this period already exists"}), 409
 
     return jsonify({"msg": "Financial summary updated successfully"}), 200
 
 @financial_summary_bp.route('/<int:summary_id>', methods=['DELETE'])
 @jwt_required()
 def delete_summary(summary_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     summary = FinancialSummary.query.filter_by(id=summary_id, user_id=user_id).first()
 
     if not summary:
@@ -1,12 +1,20 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, current_user
 from app.extensions import db
-from app.models import Asset, User
+from app.models import Asset
 from app.utils.decorators import admin_required
+from app.utils.pagination import paginate, page_response
+from app.utils.conditional import conditional
+from app.utils.serializers import asset_rows, dump_asset
+from app.utils.streaming import wants_stream, stream_json
+from app.utils.booking import free_assets
+from app.utils.catalog import filter_assets, CatalogError
+from app.utils.analytics import fleet_analytics
+from app.utils.bulk import iter_request_rows, import_assets, change_status, is_id, BulkError
+from datetime import datetime, date, timedelta
 import logging
 
 # Налаштування логування
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 objects_bp = Blueprint('objects', __name__)
@@ -14,7 +22,7 @@ objects_bp = Blueprint('objects', __name__)
 @objects_bp.route('/', methods=['POST'])
 @admin_required
 def add_asset():
-    logger.info("Received request to add a new asset")
+    logger.debug("Received request to add a new asset")
     data = request.get_json()
     name = data.get('name')
     type = data.get('type')
@@ -31,102 +39,201 @@ def add_asset():
         logger.warning("Invalid price_per_day format")
         return jsonify({"msg": "Invalid price_per_day format"}), 400
 
-    user_id = get_jwt_identity()
-    try:
-        user_id = int(user_id)
-    except ValueError:
-        logger.error("Invalid token")
-        return jsonify({"msg": "Invalid token"}), 422
-
-    user = User.query.get(user_id)
-    if not user or not user.is_admin:
-        logger.warning("Unauthorized user attempted to add an asset")
-        return jsonify({"msg": "Admins only!"}), 403
-
     new_asset = Asset(
         name=name,
         type=type,
         description=description,
         status='Доступно',
         price_per_day=price_per_day,
-        user_id=user_id
+        user_id=current_user.id
     )
     try:
         db.session.add(new_asset)
         db.session.commit()
-        logger.info(f"Asset '{name}' added successfully with ID {new_asset.id}")
+        logger.info("Asset '%s' added successfully with ID %s", name, new_asset.id)
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error adding asset: {e}")
+        logger.error("Error adding asset: %s", e)
         return jsonify({"msg": "Internal server error"}), 500
 
     return jsonify({"msg": "Asset added successfully", "id": new_asset.id}), 201
 
+@objects_bp.route('/bulk', methods=['POST'])
+@admin_required
+def add_assets_bulk():
+    """
+    Масовий імпорт об'єктів: JSON-масив, CSV з заголовком або NDJSON.
+    Помилкові рядки пропускаються і повертаються списком errors.
+    """
+    try:
+        inserted, errors = import_assets(iter_request_rows(), current_user.id)
+    except BulkError as e:
+        logger.warning("Bulk import rejected: %s", e.msg)
+        return jsonify({"msg": e.msg}), e.status
+
+    logger.info("Bulk import: %s assets added, %s rows rejected", inserted, len(errors))
+    status = 201 if inserted or not errors else 400
+    return jsonify({"msg": f"{inserted} assets added", "inserted": inserted, "errors": errors}), status
+
+
+def _bulk_status_change(from_status, to_status):
+    data = request.get_json(silent=True) or {}
+    ids = data.get('ids')
+    limit = current_app.config.get('BULK_CHUNK_SIZE', 1000)
+
+    if not isinstance(ids, list) or not ids or not all(is_id(i) for i in ids):
+        return jsonify({"msg": "ids must be a non-empty list of asset IDs"}), 400
+    if len(ids) > limit:
+        return jsonify({"msg": f"At most {limit} ids per request"}), 400
+
+    try:
+        updated, errors = change_status(list(dict.fromkeys(ids)), from_status, to_status)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error("Error changing status in bulk: %s", e)
+        return jsonify({"msg": "Internal server error"}), 500
+
+    logger.info("Bulk status change to '%s': %s assets, %s rejected", to_status, len(updated), len(errors))
+    return jsonify({"msg": f"{len(updated)} assets set to '{to_status}'", "updated": updated, "errors": errors}), 200
+
+@objects_bp.route('/bulk/maintenance', methods=['POST'])
+@admin_required
+def set_maintenance_bulk():
+    return _bulk_status_change('Доступно', 'На обслуговуванні')
+
+@objects_bp.route('/bulk/available', methods=['POST'])
+@admin_required
+def set_available_bulk():
+    return _bulk_status_change('На обслуговуванні', 'Доступно')
+
 @objects_bp.route('/', methods=['GET'])
 @jwt_required()
+@conditional('assets')
 def get_assets():
-    logger.info("Received request to get assets")
-    user_id = get_jwt_identity()
+    """
+    Каталог об'єктів з фільтрами type, min_price, max_price, status (адміни),
+    повнотекстовим пошуком q та сортуванням sort=<поле> / sort=-<поле>.
+    """
+    logger.debug("Received request to get assets")
+
+    if current_user.is_admin:
+        query = Asset.query
+    else:
+        query = Asset.query.filter_by(status='Доступно')
+
     try:
-        user_id = int(user_id)
+        query, sort_columns, descending = filter_assets(query, request.args, allow_status=current_user.is_admin)
+    except CatalogError as e:
+        logger.warning("Invalid catalog query: %s", e)
+        return jsonify({"msg": str(e)}), 400
+
+    query = asset_rows(query)
+    if wants_stream():
+        order = [col.desc() for col in sort_columns] if descending else sort_columns
+        return stream_json(query.order_by(*order), dump_asset)
+
+    page = paginate(query, sort_columns, descending)
+    assets_data = [dump_asset(row) for row in page.items]
+
+    logger.debug("Returning %s assets", len(assets_data))
+    return page_response(page, assets_data)
+
+@objects_bp.route('/availability', methods=['GET'])
+@jwt_required()
+@conditional('assets', 'rentals')
+def get_availability():
+    """
+    Об'єкти, вільні на інтервал [from, to); необов'язковий фільтр type.
+    """
+    from_str = request.args.get('from')
+    to_str = request.args.get('to')
+    asset_type = request.args.get('type')
+
+    if not from_str or not to_str:
+        logger.warning("Missing from/to for availability search")
+        return jsonify({"msg": "from and to are required."}), 400
+
+    try:
+        start_date = datetime.strptime(from_str, '%Y-%m-%d').date()
+        end_date = datetime.strptime(to_str, '%Y-%m-%d').date()
     except ValueError:
-        logger.error("Invalid token")
-        return jsonify({"msg": "Invalid token"}), 422
+        logger.warning("Invalid date format")
+        return jsonify({"msg": "Invalid date format. Use YYYY-MM-DD."}), 400
 
-    user = User.query.get(user_id)
-    if not user:
-        logger.warning(f"User with ID {user_id} not found")
-        return jsonify({"msg": "User not found"}), 404
+    if end_date <= start_date:
+        logger.warning("End date must be after start date")
+        return jsonify({"msg": "End date must be after start date."}), 400
 
-    if user.is_admin:
-        assets = Asset.query.all()
-    else:
-        assets = Asset.query.filter_by(status='Доступно').all()
-
-    assets_data = [{
-        "id": asset.id,
-        "name": asset.name,
-        "type": asset.type,
-        "description": asset.description,
-        "status": asset.status,
-        "price_per_day": float(asset.price_per_day),
-        "created_at": asset.created_at.isoformat(),
-        "updated_at": asset.updated_at.isoformat()
-    } for asset in assets]
-
-    logger.info(f"Returning {len(assets_data)} assets")
-    return jsonify(assets_data), 200
+    query = free_assets(start_date, end_date)
+    if asset_type:
+        query = query.filter(Asset.type == asset_type)
+
+    page = paginate(asset_rows(query), [Asset.id])
+    assets_data = [dump_asset(row) for row in page.items]
+
+    logger.debug("Returning %s assets free from %s to %s", len(assets_data), start_date, end_date)
+    return page_response(page, assets_data)
+
+@objects_bp.route('/analytics', methods=['GET'])
+@admin_required
+@conditional('assets', 'rentals')
+def get_analytics():
+    """
+    Завантаженість, дохід і кількість оренд по об'єктах за вікно [from, to)
+    (за замовчуванням — останні 30 днів); необов'язковий фільтр type.
+    """
+    from_str = request.args.get('from')
+    to_str = request.args.get('to')
+    asset_type = request.args.get('type')
+
+    try:
+        end_date = datetime.strptime(to_str, '%Y-%m-%d').date() if to_str else date.today()
+        start_date = datetime.strptime(from_str, '%Y-%m-%d').date() if from_str else end_date - timedelta(days=30)
+    except ValueError:
+        logger.warning("Invalid date format")
+        return jsonify({"msg": "Invalid date format. Use YYYY-MM-DD."}), 400
+
+    if end_date <= start_date:
+        logger.warning("End date must be after start date")
+        return jsonify({"msg": "End date must be after start date."}), 400
+
+    query = db.session.query(Asset.id, Asset.name, Asset.type, Asset.status)
+    if asset_type:
+        query = query.filter(Asset.type == asset_type)
+
+    page = paginate(query, [Asset.id])
+    assets_data = fleet_analytics(page.items, start_date, end_date)
+
+    return page_response(page, {
+        "from": start_date,
+        "to": end_date,
+        "days": (end_date - start_date).days,
+        "assets": assets_data
+    })
 
 @objects_bp.route('/<int:asset_id>', methods=['GET'])
 @jwt_required()
+@conditional('assets')
 def get_asset(asset_id):
-    logger.info(f"Received GET request for asset ID {asset_id}")
-    asset = Asset.query.get(asset_id)
+    logger.debug("Received GET request for asset ID %s", asset_id)
+    asset = asset_rows(Asset.query.filter_by(id=asset_id)).first()
     if not asset:
-        logger.warning(f"Asset with ID {asset_id} not found")
+        logger.warning("Asset with ID %s not found", asset_id)
         return jsonify({"msg": "Asset not found"}), 404
 
-    asset_data = {
-        "id": asset.id,
-        "name": asset.name,
-        "type": asset.type,
-        "description": asset.description,
-        "status": asset.status,
-        "price_per_day": float(asset.price_per_day),
-        "created_at": asset.created_at.isoformat(),
-        "updated_at": asset.updated_at.isoformat()
-    }
-
-    logger.info(f"Returning data for asset ID {asset_id}")
+    asset_data = dump_asset(asset)
+
+    logger.debug("Returning data for asset ID %s", asset_id)
     return jsonify(asset_data), 200
 
 @objects_bp.route('/<int:asset_id>', methods=['PUT'])
 @admin_required
 def update_asset(asset_id):
-    logger.info(f"Received request to update asset with ID {asset_id}")
+    logger.debug("Received request to update asset with ID %s", asset_id)
     asset = Asset.query.get(asset_id)
     if not asset:
-        logger.warning(f"Asset with ID {asset_id} not found")
+        logger.warning("Asset with ID %s not found", asset_id)
         return jsonify({"msg": "Asset not found"}), 404
 
     data = request.get_json()
@@ -142,10 +249,10 @@ def update_asset(asset_id):
 
     try:
         db.session.commit()
-        logger.info(f"Asset with ID {asset_id} updated successfully")
+        logger.info("Asset with ID %s updated successfully", asset_id)
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error updating asset: {e}")
+        logger.error("Error updating asset: %s", e)
         return jsonify({"msg": "Internal server error"}), 500
 
     return jsonify({"msg": "Asset updated successfully"}), 200
@@ -153,19 +260,19 @@ def update_asset(asset_id):
 @objects_bp.route('/<int:asset_id>', methods=['DELETE'])
 @admin_required
 def delete_asset(asset_id):
-    logger.info(f"Received request to delete asset with ID {asset_id}")
+    logger.debug("Received request to delete asset with ID %s", asset_id)
     asset = Asset.query.get(asset_id)
     if not asset:
-        logger.warning(f"Asset with ID {asset_id} not found")
+        logger.warning("Asset with ID %s not found", asset_id)
         return jsonify({"msg": "Asset not found"}), 404
 
     try:
         db.session.delete(asset)
         db.session.commit()
-        logger.info(f"Asset with ID {asset_id} deleted successfully")
+        logger.info("Asset with ID %s deleted successfully", asset_id)
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error deleting asset: {e}")
+        logger.error("Error deleting asset: %s", e)
         return jsonify({"msg": "Internal server error"}), 500
 
     return jsonify({"msg": "Asset deleted successfully"}), 200
@@ -173,23 +280,23 @@ def delete_asset(asset_id):
 @objects_bp.route('/<int:asset_id>/maintenance', methods=['POST'])
 @admin_required
 def set_maintenance(asset_id):
-    logger.info(f"Received request to set maintenance for asset ID {asset_id}")
+    logger.debug("Received request to set maintenance for asset ID %s", asset_id)
     asset = Asset.query.get(asset_id)
     if not asset:
-        logger.warning(f"Asset with ID {asset_id} not found")
+        logger.warning("Asset with ID %s not found", asset_id)
         return jsonify({"msg": "Asset not found"}), 404
 
     if asset.status != 'Доступно':
-        logger.warning(f"Cannot set maintenance for asset with status '{asset.status}'")
+        logger.warning("Cannot set maintenance for asset with status '%s'", asset.status)
         return jsonify({"msg": f"Cannot set maintenance for asset with status '{asset.status}'"}), 400
 
     asset.status = 'На обслуговуванні'
     try:
         db.session.commit()
-        logger.info(f"Asset ID {asset_id} status set to 'На обслуговуванні'")
+        logger.info("Asset ID %s status set to 'На обслуговуванні'", asset_id)
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error setting maintenance status: {e}")
+        logger.error("Error setting maintenance status: %s", e)
         return jsonify({"msg": "Internal server error"}), 500
 
     return jsonify({"msg": "Asset status set to 'На обслуговуванні'"}), 200
@@ -197,23 +304,23 @@ def set_maintenance(asset_id):
 @objects_bp.route('/<int:asset_id>/available', methods=['POST'])
 @admin_required
 def set_available(asset_id):
-    logger.info(f"Received request to set available for asset ID {asset_id}")
+    logger.debug("Received request to set available for asset ID %s", asset_id)
     asset = Asset.query.get(asset_id)
     if not asset:
-        logger.warning(f"Asset with ID {asset_id} not found")
+        logger.warning("Asset with ID %s not found", asset_id)
         return jsonify({"msg": "Asset not found"}), 404
 
     if asset.status != 'На обслуговуванні':
-        logger.warning(f"Cannot set available for asset with status '{asset.status}'")
+        logger.warning("Cannot set available for asset with status '%s'", asset.status)
         return jsonify({"msg": f"Cannot set available for asset with status '{asset.status}'"}), 400
 
     asset.status = 'Доступно'
     try:
         db.session.commit()
-        logger.info(f"Asset ID {asset_id} status set to 'Доступно'")
+        logger.info("Asset ID %s status set to 'Доступно'", asset_id)
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error setting available status: {e}")
+        logger.error("Error setting available status: %s", e)
         return jsonify({"msg": "Internal server error"}), 500
 
     return jsonify({"msg": "Asset status set to 'Доступно'"}), 200
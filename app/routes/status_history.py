@@ -1,7 +1,11 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 from app.extensions import db
 from app.models import StatusHistory, Asset
+from app.utils.pagination import paginate, page_response
+from app.utils.conditional import conditional
+from app.utils.serializers import status_history_rows, dump_status_history
+from app.utils.audit import history_range, archived_history
 from datetime import datetime
 
 status_history_bp = Blueprint('status_history', __name__)
@@ -9,12 +13,6 @@ status_history_bp = Blueprint('status_history', __name__)
 @status_history_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_status_history():
-    user_id = get_jwt_identity()
-    try:
-        user_id = int(user_id)
-    except ValueError:
-        return jsonify({"msg": "Invalid token"}), 422
-
     data = request.get_json()
 
     asset_id = data.get('asset_id')
@@ -50,98 +48,111 @@ def create_status_history():
 
 @status_history_bp.route('/<int:history_id>', methods=['GET'])
 @jwt_required()
+@conditional('status_histories')
 def get_status_history(history_id):
-    user_id = get_jwt_identity()
-    try:
-        user_id = int(user_id)
-    except ValueError:
-        return jsonify({"msg": "Invalid token"}), 422
-
     history = StatusHistory.query.get(history_id)
 
     if not history:
         return jsonify({"msg": "Status history not found"}), 404
 
-    history_data = {
-        "id": history.id,
-        "asset_id": history.asset_id,
-        "previous_status": history.previous_status,
-        "new_status": history.new_status,
-        "changed_at": history.changed_at.isoformat()
-    }
+    history_data = dump_status_history(history)
 
     return jsonify(history_data), 200
 
-@status_history_bp.route('/', methods=['GET'])
-@jwt_required()
-def get_all_status_histories():
-    user_id = get_jwt_identity()
+def _time_range():
+    """
+    Необов'язкові межі from/to (ISO-дата або дата-час) -> ((since, until), помилка).
+    """
     try:
-        user_id = int(user_id)
+        since = datetime.fromisoformat(request.args['from']) if request.args.get('from') else None
+        until = datetime.fromisoformat(request.args['to']) if request.args.get('to') else None
     except ValueError:
-        return jsonify({"msg": "Invalid token"}), 422
-
-    assets = Asset.query.filter_by(user_id=user_id).all()
-    asset_ids = [asset.id for asset in assets]
-
-    histories = StatusHistory.query.filter(StatusHistory.asset_id.in_(asset_ids)).all()
-    histories_data = [{
-        "id": history.id,
-        "asset_id": history.asset_id,
-        "previous_status": history.previous_status,
-        "new_status": history.new_status,
-        "changed_at": history.changed_at.isoformat()
-    } for history in histories]
+        return None, (jsonify({"msg": "Invalid 'from'/'to' date. Use ISO 8601, e.g. 2024-01-31 or 2024-01-31T12:00:00."}), 400)
+    return (since, until), None
 
-    return jsonify(histories_data), 200
-
-@status_history_bp.route('/<int:history_id>', methods=['PUT'])
+@status_history_bp.route('/', methods=['GET'])
 @jwt_required()
-def update_status_history(history_id):
-    user_id = get_jwt_identity()
-    try:
-        user_id = int(user_id)
-    except ValueError:
-        return jsonify({"msg": "Invalid token"}), 422
-
-    history = StatusHistory.query.get(history_id)
-
-    if not history:
-        return jsonify({"msg": "Status history not found"}), 404
-
-    data = request.get_json()
-
-    previous_status = data.get('previous_status')
-    new_status = data.get('new_status')
-
-    if previous_status:
-        history.previous_status = previous_status
-    if new_status:
-        history.new_status = new_status
-        # Оновлення статусу об'єкта
-        history.asset.status = new_status
-
-    history.changed_at = datetime.utcnow()
-
-    db.session.commit()
-
-    return jsonify({"msg": "Status history updated successfully"}), 200
+@conditional('status_histories', 'assets')
+def get_all_status_histories():
+    """
+    Історія статусів об'єктів користувача одним JOIN по assets.user_id;
+    необов'язковий фільтр from/to по changed_at.
+    """
+    time_range, error = _time_range()
+    if error:
+        return error
+    since, until = time_range
+
+    query = (StatusHistory.query
+             .join(Asset, StatusHistory.asset_id == Asset.id)
+             .filter(Asset.user_id == current_user.id))
+    if since:
+        query = query.filter(StatusHistory.changed_at >= since)
+    if until:
+        query = query.filter(StatusHistory.changed_at < until)
+
+    page = paginate(status_history_rows(query), [StatusHistory.changed_at, StatusHistory.id])
+    histories_data = [dump_status_history(row) for row in page.items]
+
+    return page_response(page, histories_data)
+
+def _timeline_asset(asset_id):
+    asset = db.session.query(Asset.id, Asset.user_id).filter(Asset.id == asset_id).first()
+    if not asset:
+        return None, (jsonify({"msg": "Asset not found"}), 404)
+    if asset.user_id != current_user.id and not current_user.is_admin:
+        return None, (jsonify({"msg": "Unauthorized"}), 403)
+    return asset, None
 
-@status_history_bp.route('/<int:history_id>', methods=['DELETE'])
+@status_history_bp.route('/asset/<int:asset_id>', methods=['GET'])
 @jwt_required()
-def delete_status_history(history_id):
-    user_id = get_jwt_identity()
-    try:
-        user_id = int(user_id)
-    except ValueError:
-        return jsonify({"msg": "Invalid token"}), 422
-
-    history = StatusHistory.query.get(history_id)
-
-    if not history:
-        return jsonify({"msg": "Status history not found"}), 404
-
-    db.session.delete(history)
-    db.session.commit()
+@conditional('status_histories')
+def get_asset_timeline(asset_id):
+    """
+    Хронологія статусів одного об'єкта: діапазонне читання по
+    (asset_id, changed_at) з тим самим курсором, що й у списку.
+    """
+    _, error = _timeline_asset(asset_id)
+    if error:
+        return error
+
+    time_range, error = _time_range()
+    if error:
+        return error
+    since, until = time_range
+    query = history_range('status_histories', asset_id, since, until)
+    page = paginate(status_history_rows(query), [StatusHistory.changed_at, StatusHistory.id])
+    histories_data = [dump_status_history(row) for row in page.items]
+
+    return page_response(page, histories_data)
+
+@status_history_bp.route('/asset/<int:asset_id>/archive', methods=['GET'])
+@jwt_required()
+@conditional('audit_archives')
+def get_asset_archive(asset_id):
+    """
+    Архівовані (старші за термін зберігання) записи історії об'єкта за from/to.
+    """
+    _, error = _timeline_asset(asset_id)
+    if error:
+        return error
+
+    time_range, error = _time_range()
+    if error:
+        return error
+    since, until = time_range
+    histories_data = [
+        dict(row, asset_id=asset_id)
+        for row in archived_history('status_histories', asset_id, since, until)
+    ]
+    return jsonify(histories_data), 200
 
-    return jsonify({"msg": "Status history deleted successfully"}), 200
+@status_history_bp.route('/<int:history_id>', methods=['PUT', 'DELETE'])
+@jwt_required()
+def modify_status_history(history_id):
+    """
+    Журнал статусів лише дописується: виправлення — це новий запис через POST.
+    """
+    return jsonify({"msg": "Status history is append-only. POST a new entry instead."}), 405, {
+        'Allow': 'GET, HEAD, OPTIONS'
+    }
@@ -1,55 +1,33 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 from app.extensions import db
 from app.models import User
 from app.utils.decorators import admin_required
+from app.utils.pagination import paginate, page_response
+from app.utils.conditional import conditional
+from app.utils.serializers import user_rows, dump_user
 import logging
 
 users_bp = Blueprint('users', __name__)
 
 # Налаштування логування
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 @users_bp.route('/profile', methods=['GET'])
 @jwt_required()
+@conditional('users')
 def get_profile():
-    user_id = get_jwt_identity()
-    try:
-        user_id = int(user_id)
-    except ValueError:
-        logger.error(f"Invalid user ID type: {user_id}")
-        return jsonify({"msg": "Invalid token"}), 422
-
-    user = User.query.get(user_id)
-    if not user:
-        logger.warning(f"User not found with ID: {user_id}")
-        return jsonify({"msg": "User not found"}), 404
+    user = current_user
 
-    user_data = {
-        "id": user.id,
-        "username": user.username,
-        "email": user.email,
-        "phone": user.phone,
-        "is_admin": user.is_admin
-    }
-    logger.info(f"User profile retrieved: {user_data}")
+    user_data = dump_user(user)
+    logger.debug("User profile retrieved for user ID: %s", user.id)
     return jsonify(user_data), 200
 
 @users_bp.route('/profile', methods=['PUT'])
 @jwt_required()
 def update_profile():
-    user_id = get_jwt_identity()
-    try:
-        user_id = int(user_id)
-    except ValueError:
-        logger.error(f"Invalid user ID type: {user_id}")
-        return jsonify({"msg": "Invalid token"}), 422
-
-    user = User.query.get(user_id)
-    if not user:
-        logger.warning(f"User not found with ID: {user_id}")
-        return jsonify({"msg": "User not found"}), 404
+    user = current_user
+    user_id = user.id
 
     data = request.get_json()
     if not data:
@@ -64,14 +42,14 @@ def update_profile():
     if username:
         existing_user = User.query.filter(User.username == username, User.id != user_id).first()
         if existing_user:
-            logger.warning(f"Username already exists: {username}")
+            logger.warning("Username already exists: %s", username)
             return jsonify({"msg": "Username already exists"}), 409
         user.username = username
 
     if email:
         existing_user = User.query.filter(User.email == email, User.id != user_id).first()
         if existing_user:
-            logger.warning(f"Email already exists: {email}")
+            logger.warning("Email already exists: %s", email)
             return jsonify({"msg": "Email already exists"}), 409
         user.email = email
 
@@ -83,43 +61,33 @@ def update_profile():
 
     try:
         db.session.commit()
-        logger.info(f"User profile updated: {user.id}")
+        logger.info("User profile updated: %s", user.id)
         return jsonify({"msg": "Profile updated successfully"}), 200
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error updating profile: {str(e)}")
+        logger.error("Error updating profile: %s", e)
         return jsonify({"msg": "Internal server error"}), 500
 
 @users_bp.route('/', methods=['GET'])
 @admin_required
+@conditional('users')
 def get_all_users():
-    users = User.query.all()
-    users_data = [{
-        "id": user.id,
-        "username": user.username,
-        "email": user.email,
-        "phone": user.phone,
-        "is_admin": user.is_admin
-    } for user in users]
-    logger.info(f"Retrieved {len(users_data)} users")
-    return jsonify({"users": users_data}), 200
+    page = paginate(user_rows(User.query), [User.id])
+    users_data = [dump_user(row) for row in page.items]
+    logger.debug("Retrieved %s users", len(users_data))
+    return page_response(page, {"users": users_data})
 
 @users_bp.route('/<int:user_id>', methods=['GET'])
 @admin_required
+@conditional('users')
 def get_user(user_id):
     user = User.query.get(user_id)
     if not user:
-        logger.warning(f"User not found with ID: {user_id}")
+        logger.warning("User not found with ID: %s", user_id)
         return jsonify({"msg": "User not found"}), 404
 
-    user_data = {
-        "id": user.id,
-        "username": user.username,
-        "email": user.email,
-        "phone": user.phone,
-        "is_admin": user.is_admin
-    }
-    logger.info(f"Retrieved user: {user_data}")
+    user_data = dump_user(user)
+    logger.debug("Retrieved user ID: %s", user.id)
     return jsonify(user_data), 200
 
 @users_bp.route('/<int:user_id>', methods=['PUT'])
@@ -127,7 +95,7 @@ def get_user(user_id):
 def update_user(user_id):
     user = User.query.get(user_id)
     if not user:
-        logger.warning(f"User not found with ID: {user_id}")
+        logger.warning("User not found with ID: %s", user_id)
         return jsonify({"msg": "User not found"}), 404
 
     data = request.get_json()
@@ -144,14 +112,14 @@ def update_user(user_id):
     if username:
         existing_user = User.query.filter(User.username == username, User.id != user_id).first()
         if existing_user:
-            logger.warning(f"Username already exists: {username}")
+            logger.warning("Username already exists: %s", username)
             return jsonify({"msg": "Username already exists"}), 409
         user.username = username
 
     if email:
         existing_user = User.query.filter(User.email == email, User.id != user_id).first()
         if existing_user:
-            logger.warning(f"Email already exists: {email}")
+            logger.warning("Email already exists: %s", email)
             return jsonify({"msg": "Email already exists"}), 409
         user.email = email
 
@@ -166,11 +134,11 @@ def update_user(user_id):
 
     try:
         db.session.commit()
-        logger.info(f"User updated: {user.id}")
+        logger.info("User updated: %s", user.id)
         return jsonify({"msg": "User updated successfully"}), 200
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error updating user: {str(e)}")
+        logger.error("Error updating user: %s", e)
         return jsonify({"msg": "Internal server error"}), 500
 
 @users_bp.route('/<int:user_id>', methods=['DELETE'])
@@ -178,17 +146,17 @@ def update_user(user_id):
 def delete_user(user_id):
     user = User.query.get(user_id)
     if not user:
-        logger.warning(f"User not found with ID: {user_id}")
+        logger.warning("User not found with ID: %s", user_id)
         return jsonify({"msg": "User not found"}), 404
 
     try:
         db.session.delete(user)
         db.session.commit()
-        logger.info(f"User deleted: {user.id}")
+        logger.info("User deleted: %s", user.id)
         return jsonify({"msg": "User deleted successfully"}), 200
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error deleting user: {e}")
+        logger.error("Error deleting user: %s", e)
         return jsonify({"msg": "Internal server error"}), 500
 
 @users_bp.route('/<int:user_id>/make_admin', methods=['POST'])
@@ -196,21 +164,21 @@ def delete_user(user_id):
 def make_admin(user_id):
     user = User.query.get(user_id)
     if not user:
-        logger.warning(f"User not found with ID: {user_id}")
+        logger.warning("User not found with ID: %s", user_id)
         return jsonify({"msg": "User not found"}), 404
 
     if user.is_admin:
-        logger.info(f"User {user.id} is already an admin")
+        logger.info("User %s is already an admin", user.id)
         return jsonify({"msg": "User is already an admin"}), 400
 
     user.is_admin = True
     try:
         db.session.commit()
-        logger.info(f"User {user.id} has been made an admin")
+        logger.info("User %s has been made an admin", user.id)
         return jsonify({"msg": "User has been made an admin"}), 200
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error making user admin: {e}")
+        logger.error("Error making user admin: %s", e)
         return jsonify({"msg": "Internal server error"}), 500
 
 @users_bp.route('/<int:user_id>/revoke_admin', methods=['POST'])
@@ -218,19 +186,19 @@ def make_admin(user_id):
 def revoke_admin(user_id):
     user = User.query.get(user_id)
     if not user:
-        logger.warning(f"User not found with ID: {user_id}")
+        logger.warning("User not found with ID: %s", user_id)
         return jsonify({"msg": "User not found"}), 404
 
     if not user.is_admin:
-        logger.info(f"User {user.id} is not an admin")
+        logger.info("User %s is not an admin", user.id)
         return jsonify({"msg": "User is not an admin"}), 400
 
     user.is_admin = False
     try:
         db.session.commit()
-        logger.info(f"Admin rights revoked from user {user.id}")
+        logger.info("Admin rights revoked from user %s", user.id)
         return jsonify({"msg": "Admin rights revoked from user"}), 200
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error revoking admin rights: {e}")
+        logger.error("Error revoking admin rights: %s", e)
         return jsonify({"msg": "Internal server error"}), 500
@@ -0,0 +1,76 @@
+from sqlalchemy import func, literal
+
+from app.extensions import db
+from app.models import Rental
+from app.utils.finance import COUNTED_STATUSES
+
+
+def _is_mysql():
+    return db.session.get_bind().dialect.name == 'mysql'
+
+
+def _days_between(later, earlier):
+    if _is_mysql():
+        return func.datediff(later, earlier)
+    return func.julianday(later) - func.julianday(earlier)
+
+
+def _least(a, b):
+    return func.least(a, b) if _is_mysql() else func.min(a, b)
+
+
+def _greatest(a, b):
+    return func.greatest(a, b) if _is_mysql() else func.max(a, b)
+
+
+def asset_utilization(asset_ids, start, end):
+    """
+    Завантаженість об'єктів за вікно [start, end) одним GROUP BY asset_id:
+    {asset_id: (rentals, rented_days, revenue)}. Дохід оренди, що виходить
+    за межі вікна, враховується пропорційно дням усередині вікна.
+    """
+    if not asset_ids:
+        return {}
+
+    window_start = literal(start, db.Date)
+    window_end = literal(end, db.Date)
+    overlap = _days_between(_least(Rental.end_date, window_end), _greatest(Rental.rental_date, window_start))
+    length = _days_between(Rental.end_date, Rental.rental_date)
+    revenue = func.coalesce(Rental.total_cost, 0.0) * overlap / func.nullif(length, 0)
+
+    rows = (db.session.query(
+                Rental.asset_id, func.count(Rental.id),
+                func.sum(overlap), func.coalesce(func.sum(revenue), 0.0))
+            .filter(
+                Rental.asset_id.in_(asset_ids),
+                Rental.status.in_(COUNTED_STATUSES),
+                Rental.rental_date < end,
+                Rental.end_date > start)
+            .group_by(Rental.asset_id)
+            .all())
+    return {
+        asset_id: (count, int(round(days or 0)), float(revenue))
+        for asset_id, count, days, revenue in rows
+    }
+
+
+def fleet_analytics(rows, start, end):
+    """
+    Рядки (id, name, type, status) сторінки об'єктів -> список зі статистикою.
+    """
+    calendar_days = (end - start).days
+    stats = asset_utilization([row.id for row in rows], start, end)
+    data = []
+    for row in rows:
+        rentals, rented_days, revenue = stats.get(row.id, (0, 0, 0.0))
+        data.append({
+            "asset_id": row.id,
+            "name": row.name,
+            "type": row.type,
+            "status": row.status,
+            "rentals": rentals,
+            "rented_days": rented_days,
+            "utilization": round(rented_days / calendar_days, 4),
+            "revenue": round(revenue, 2),
+        })
+    return data
@@ -0,0 +1,132 @@
+"""
+Журнал змін (status_histories, rental_histories) — лише дописується: ORM не дає
+змінити чи видалити запис. Записи, старші за термін зберігання, згортаються
+в audit_archives (по одному стиснутому блоку на об'єкт/оренду за місяць).
+"""
+import json
+import zlib
+from collections import defaultdict
+from datetime import date, datetime
+
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import StatusHistory, RentalHistory, AuditArchive
+
+# Таблиця -> (модель, колонка-ключ для діапазонних читань)
+SOURCES = {
+    'status_histories': (StatusHistory, StatusHistory.asset_id),
+    'rental_histories': (RentalHistory, RentalHistory.rental_id),
+}
+
+
+class AuditError(Exception):
+    pass
+
+
+def _forbid_change(mapper, connection, target):
+    raise AuditError(f"{target.__tablename__} is append-only")
+
+
+for _model, _ in SOURCES.values():
+    event.listen(_model, 'before_update', _forbid_change)
+    event.listen(_model, 'before_delete', _forbid_change)
+
+
+def _pack(rows):
+    data = [[row.id, row.previous_status, row.new_status, row.changed_at.isoformat()] for row in rows]
+    return zlib.compress(json.dumps(data, separators=(',', ':')).encode(), 9)
+
+
+def _unpack(payload):
+    return [
+        {"id": id, "previous_status": previous, "new_status": new, "changed_at": datetime.fromisoformat(changed_at)}
+        for id, previous, new, changed_at in json.loads(zlib.decompress(payload))
+    ]
+
+
+def _compact_batch(source, before, batch_size):
+    model, key = SOURCES[source]
+    rows = (db.session.query(model.id, key.label('key_id'), model.previous_status,
+                             model.new_status, model.changed_at)
+            .filter(model.changed_at < before)
+            .order_by(model.id)
+            .limit(batch_size)
+            .all())
+    if not rows:
+        return 0
+
+    groups = defaultdict(list)
+    for row in rows:
+        groups[(row.key_id, date(row.changed_at.year, row.changed_at.month, 1))].append(row)
+
+    now = datetime.utcnow()
+    db.session.execute(AuditArchive.__table__.insert(), [{
+        'source': source,
+        'key_id': key_id,
+        'period_start': period_start,
+        'first_id': group[0].id,
+        'last_id': group[-1].id,
+        'first_changed_at': min(row.changed_at for row in group),
+        'last_changed_at': max(row.changed_at for row in group),
+        'row_count': len(group),
+        'payload': _pack(group),
+        'created_at': now,
+    } for (key_id, period_start), group in groups.items()])
+
+    # id зростають монотонно: пачка — це всі старі рядки з id не більшим за останній
+    db.session.execute(
+        model.__table__.delete()
+        .where(model.__table__.c.id <= rows[-1].id, model.__table__.c.changed_at < before)
+    )
+    db.session.commit()
+    return len(rows)
+
+
+def compact(before, batch_size=10000):
+    """
+    Перенести записи журналу, старші за before, в audit_archives пачками по
+    batch_size (кожна — окрема транзакція). Повертає {таблиця: кількість}.
+    """
+    moved = {}
+    for source in SOURCES:
+        moved[source] = 0
+        while True:
+            count = _compact_batch(source, before, batch_size)
+            if not count:
+                break
+            moved[source] += count
+    return moved
+
+
+def history_range(source, key_id, since=None, until=None):
+    """
+    Живі записи одного об'єкта/оренди за [since, until): діапазонне читання
+    по індексу (key, changed_at).
+    """
+    model, key = SOURCES[source]
+    query = model.query.filter(key == key_id)
+    if since:
+        query = query.filter(model.changed_at >= since)
+    if until:
+        query = query.filter(model.changed_at < until)
+    return query
+
+
+def archived_history(source, key_id, since=None, until=None):
+    """
+    Розпаковані архівні записи одного об'єкта/оренди за [since, until), за зростанням id.
+    """
+    query = AuditArchive.query.filter_by(source=source, key_id=key_id)
+    if since:
+        query = query.filter(AuditArchive.last_changed_at >= since)
+    if until:
+        query = query.filter(AuditArchive.first_changed_at < until)
+
+    rows = []
+    for archive in query.order_by(AuditArchive.first_id):
+        rows.extend(
+            row for row in _unpack(archive.payload)
+            if (not since or row['changed_at'] >= since) and (not until or row['changed_at'] < until)
+        )
+    return rows
@@ -0,0 +1,22 @@
+from flask import jsonify
+from app.extensions import db
+from app.models import User
+
+
+def register_user_loader(jwt):
+    """
+    Користувач завантажується один раз на запит і доступний через
+    flask_jwt_extended.current_user (бібліотека кешує його на flask.g).
+    """
+
+    @jwt.user_lookup_loader
+    def load_user(_jwt_header, jwt_data):
+        try:
+            user_id = int(jwt_data['sub'])
+        except (ValueError, TypeError):
+            return None
+        return db.session.get(User, user_id)
+
+    @jwt.user_lookup_error_loader
+    def user_not_found(_jwt_header, jwt_data):
+        return jsonify({"msg": "User not found"}), 404
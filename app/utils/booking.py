@@ -0,0 +1,144 @@
+from datetime import datetime
+
+from app.extensions import db
+from app.models import Rental, Asset, RentalHistory
+
+
+class BookingError(Exception):
+    def __init__(self, msg, status=400):
+        super().__init__(msg)
+        self.msg = msg
+        self.status = status
+
+
+def overlapping_rentals(asset_ids, start_date, end_date):
+    """
+    Активні оренди, що перетинаються з [start_date, end_date).
+    Запит іде по індексу ix_rentals_asset_id_status_dates.
+    """
+    return Rental.query.filter(
+        Rental.asset_id.in_(asset_ids),
+        Rental.status == 'Активний',
+        Rental.rental_date < end_date,
+        Rental.end_date > start_date
+    )
+
+
+def free_assets(start_date, end_date):
+    """
+    Об'єкти, вільні на весь інтервал [start_date, end_date): anti-join NOT EXISTS
+    по індексу rentals(asset_id, status, rental_date, end_date) — для кожного
+    об'єкта перевіряється лише діапазон його оренд, а не вся таблиця.
+    """
+    busy = Rental.query.filter(
+        Rental.asset_id == Asset.id,
+        Rental.status == 'Активний',
+        Rental.rental_date < end_date,
+        Rental.end_date > start_date
+    )
+    return Asset.query.filter(Asset.status == 'Доступно', ~busy.exists())
+
+
+def lock_assets(asset_ids):
+    """
+    Заблокувати рядки об'єктів до кінця транзакції; повертає {id: Asset}.
+    """
+    if db.session.get_bind().dialect.name == 'sqlite':
+        # SQLite ігнорує FOR UPDATE: порожній UPDATE одразу бере блокування на запис
+        db.session.execute(
+            db.text("UPDATE assets SET id = id WHERE id IN :ids").bindparams(db.bindparam('ids', expanding=True)),
+            {"ids": list(asset_ids)}
+        )
+    assets = Asset.query.filter(Asset.id.in_(asset_ids)).order_by(Asset.id).with_for_update().all()
+    return {asset.id: asset for asset in assets}
+
+
+def book_asset(user_id, asset_id, start_date, end_date):
+    """
+    Забронювати об'єкт на [start_date, end_date) у поточній транзакції.
+
+    Рядок об'єкта блокується SELECT ... FOR UPDATE, тож паралельні бронювання
+    одного об'єкта виконуються по черзі, і перевірка перетину не має гонок.
+    Commit робить викликач.
+    """
+    asset = lock_assets([asset_id]).get(asset_id)
+    if not asset:
+        raise BookingError("Asset not found.", 404)
+
+    if asset.status != 'Доступно':
+        raise BookingError("Asset is not available for rent.", 400)
+
+    # Блокуюче читання бачить останні зафіксовані оренди, а не знімок початку транзакції
+    if overlapping_rentals([asset_id], start_date, end_date).with_for_update(read=True).first():
+        raise BookingError("Asset is already booked for these dates.", 409)
+
+    rental = Rental(
+        asset_id=asset_id,
+        user_id=user_id,
+        rental_date=start_date,
+        end_date=end_date,
+        total_cost=(end_date - start_date).days * asset.price_per_day,
+        status='Активний'
+    )
+    db.session.add(rental)
+    db.session.flush()
+
+    db.session.add(RentalHistory(
+        rental_id=rental.id,
+        previous_status='',
+        new_status=rental.status,
+        changed_at=datetime.utcnow()
+    ))
+    return rental
+
+
+def book_assets(user_id, asset_ids, start_date, end_date):
+    """
+    Забронювати кілька об'єктів на [start_date, end_date) однією транзакцією:
+    або всі, або жоден. Кількість запитів не залежить від кількості об'єктів:
+    блокування, перевірка перетинів, вставка оренд та історії — по одному.
+    Повертає [(rental_id, asset_id, total_cost)]; commit робить викликач.
+    """
+    assets = lock_assets(asset_ids)
+
+    missing = [asset_id for asset_id in asset_ids if asset_id not in assets]
+    if missing:
+        raise BookingError(f"Assets not found: {missing}", 404)
+
+    unavailable = [asset_id for asset_id in asset_ids if assets[asset_id].status != 'Доступно']
+    if unavailable:
+        raise BookingError(f"Assets are not available for rent: {unavailable}", 400)
+
+    booked = (overlapping_rentals(asset_ids, start_date, end_date)
+              .with_entities(Rental.asset_id).distinct()
+              .with_for_update(read=True).all())
+    if booked:
+        raise BookingError(f"Assets are already booked for these dates: {sorted(a for a, in booked)}", 409)
+
+    days = (end_date - start_date).days
+    db.session.execute(Rental.__table__.insert(), [{
+        'asset_id': asset_id,
+        'user_id': user_id,
+        'rental_date': start_date,
+        'end_date': end_date,
+        'total_cost': days * assets[asset_id].price_per_day,
+        'status': 'Активний',
+    } for asset_id in asset_ids])
+
+    # Об'єкти заблоковані й без перетинів, тож активна оренда з цими датами в кожного рівно одна
+    rentals = (db.session.query(Rental.id, Rental.asset_id, Rental.total_cost)
+               .filter(Rental.asset_id.in_(asset_ids),
+                       Rental.status == 'Активний',
+                       Rental.rental_date == start_date,
+                       Rental.end_date == end_date)
+               .order_by(Rental.id)
+               .all())
+
+    now = datetime.utcnow()
+    db.session.execute(RentalHistory.__table__.insert().values([{
+        'rental_id': rental_id,
+        'previous_status': '',
+        'new_status': 'Активний',
+        'changed_at': now,
+    } for rental_id, _, _ in rentals]))
+    return rentals
@@ -0,0 +1,192 @@
+import csv
+import io
+import json
+import math
+from datetime import datetime
+
+from flask import current_app, request
+
+from app.extensions import db
+from app.models import Asset, StatusHistory
+from app.utils.booking import lock_assets
+
+NDJSON_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+# Довжини рядкових колонок assets; description — TEXT (64 КБ у MySQL)
+MAX_LENGTHS = {
+    'name': Asset.__table__.c.name.type.length,
+    'type': Asset.__table__.c.type.type.length,
+}
+MAX_DESCRIPTION_BYTES = 65535
+
+
+class BulkError(ValueError):
+    def __init__(self, msg, status=400):
+        super().__init__(msg)
+        self.msg = msg
+        self.status = status
+
+
+def _text_stream():
+    return io.TextIOWrapper(request.stream, encoding='utf-8-sig', newline='')
+
+
+def iter_request_rows():
+    """
+    Рядки тіла запиту як (номер, dict | помилка): JSON-масив, CSV з заголовком
+    або NDJSON. CSV і NDJSON читаються потоком, без завантаження всього тіла.
+    """
+    mimetype = request.mimetype
+    if mimetype == 'application/json':
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            data = data.get('assets')
+        if not isinstance(data, list):
+            raise BulkError("Expected a JSON array of assets")
+        yield from enumerate(data, start=1)
+    elif mimetype == 'text/csv':
+        yield from enumerate(csv.DictReader(_text_stream()), start=1)
+    elif mimetype in NDJSON_TYPES:
+        for number, line in enumerate(_text_stream(), start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError:
+                yield number, "Invalid JSON"
+    else:
+        raise BulkError("Use application/json, text/csv or application/x-ndjson", 415)
+
+
+def is_id(value):
+    # bool — підклас int, але True/False не є id
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _parse_price(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return None
+    try:
+        price = float(value)
+    except ValueError:
+        return None
+    return price if math.isfinite(price) else None
+
+
+def validate_asset(raw):
+    """
+    Перевірити рядок імпорту; повертає (значення, None) або (None, помилка).
+    """
+    if isinstance(raw, str):
+        return None, raw
+    if not isinstance(raw, dict):
+        return None, "Row must be an object"
+
+    name = raw.get('name')
+    type = raw.get('type')
+    description = raw.get('description') or ''
+    price_per_day = raw.get('price_per_day')
+    if not name or not type or price_per_day in (None, ''):
+        return None, "Name, type, and price_per_day are required"
+    for field, value in (('name', name), ('type', type)):
+        if not isinstance(value, str):
+            return None, f"{field} must be a string"
+        if len(value) > MAX_LENGTHS[field]:
+            return None, f"{field} must be at most {MAX_LENGTHS[field]} characters"
+    if not isinstance(description, str):
+        return None, "description must be a string"
+    if len(description.encode('utf-8')) > MAX_DESCRIPTION_BYTES:
+        return None, f"description must be at most {MAX_DESCRIPTION_BYTES} bytes"
+    price_per_day = _parse_price(price_per_day)
+    if price_per_day is None:
+        return None, "Invalid price_per_day format"
+
+    return {
+        'name': name,
+        'type': type,
+        'description': description,
+        'price_per_day': price_per_day,
+    }, None
+
+
+def _insert(rows, user_id):
+    now = datetime.utcnow()
+    db.session.execute(Asset.__table__.insert(), [
+        dict(values, user_id=user_id, status='Доступно', created_at=now, updated_at=now)
+        for _, values in rows
+    ])
+    db.session.commit()
+
+
+def _insert_chunk(chunk, user_id, errors):
+    try:
+        _insert(chunk, user_id)
+        return len(chunk)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.warning("Bulk asset insert failed, retrying %s rows one by one: %s", len(chunk), e)
+
+    # Пачка впала — по одному рядку, щоб помилку отримав лише поганий рядок
+    inserted = 0
+    for row in chunk:
+        try:
+            _insert([row], user_id)
+            inserted += 1
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error("Bulk asset insert failed for row %s: %s", row[0], e)
+            errors.append({"row": row[0], "msg": "Could not insert row"})
+    return inserted
+
+
+def import_assets(rows, user_id, chunk_size=None):
+    """
+    Вставити об'єкти пачками (executemany), кожна пачка — окрема транзакція.
+    Повертає (кількість вставлених, [{"row", "msg"}]).
+    """
+    chunk_size = chunk_size or current_app.config.get('BULK_CHUNK_SIZE', 1000)
+    inserted = 0
+    errors = []
+    chunk = []
+    for number, raw in rows:
+        values, error = validate_asset(raw)
+        if error:
+            errors.append({"row": number, "msg": error})
+            continue
+        chunk.append((number, values))
+        if len(chunk) >= chunk_size:
+            inserted += _insert_chunk(chunk, user_id, errors)
+            chunk = []
+    if chunk:
+        inserted += _insert_chunk(chunk, user_id, errors)
+    return inserted, errors
+
+
+def change_status(asset_ids, from_status, to_status):
+    """
+    Перевести об'єкти зі статусу from_status у to_status однією транзакцією:
+    рядки блокуються, історія пишеться одним INSERT, статус — одним UPDATE.
+    Повертає (оновлені id, [{"id", "msg"}]); commit робить викликач.
+    """
+    assets = lock_assets(asset_ids)
+    updated, errors = [], []
+    for asset_id in asset_ids:
+        asset = assets.get(asset_id)
+        if asset is None:
+            errors.append({"id": asset_id, "msg": "Asset not found"})
+        elif asset.status != from_status:
+            errors.append({"id": asset_id, "msg": f"Cannot change asset with status '{asset.status}'"})
+        else:
+            updated.append(asset_id)
+
+    if updated:
+        now = datetime.utcnow()
+        db.session.execute(StatusHistory.__table__.insert().values([{
+            'asset_id': asset_id,
+            'previous_status': from_status,
+            'new_status': to_status,
+            'changed_at': now,
+        } for asset_id in updated]))
+        Asset.query.filter(Asset.id.in_(updated)).update(
+            {Asset.status: to_status, Asset.updated_at: now}, synchronize_session=False
+        )
+    return updated, errors
@@ -0,0 +1,72 @@
+import math
+
+from sqlalchemy import or_
+from sqlalchemy.dialects.mysql import match
+
+from app.extensions import db
+from app.models import Asset
+
+SORT_FIELDS = {
+    'id': Asset.id,
+    'name': Asset.name,
+    'type': Asset.type,
+    'price_per_day': Asset.price_per_day,
+    'created_at': Asset.created_at,
+}
+
+
+class CatalogError(ValueError):
+    pass
+
+
+def _parse_price(value, name):
+    try:
+        price = float(value)
+    except ValueError:
+        raise CatalogError(f"Invalid {name} format")
+    if not math.isfinite(price):
+        raise CatalogError(f"Invalid {name} format")
+    return price
+
+
+def text_search(query, text):
+    """
+    Повнотекстовий пошук по name/description: FULLTEXT-індекс у MySQL,
+    LIKE для інших БД (SQLite у розробці).
+    """
+    if db.session.get_bind().dialect.name == 'mysql':
+        return query.filter(match(Asset.name, Asset.description, against=text).in_boolean_mode())
+    pattern = f"%{text}%"
+    return query.filter(or_(Asset.name.ilike(pattern), Asset.description.ilike(pattern)))
+
+
+def filter_assets(query, args, allow_status=True):
+    """
+    Застосувати фільтри каталогу з параметрів запиту:
+    type, min_price, max_price, status, q, sort (name / -price_per_day ...).
+    Повертає (query, sort_columns, descending) для paginate().
+    """
+    if args.get('type'):
+        query = query.filter(Asset.type == args['type'])
+
+    if args.get('min_price'):
+        query = query.filter(Asset.price_per_day >= _parse_price(args['min_price'], 'min_price'))
+
+    if args.get('max_price'):
+        query = query.filter(Asset.price_per_day <= _parse_price(args['max_price'], 'max_price'))
+
+    if allow_status and args.get('status'):
+        query = query.filter(Asset.status == args['status'])
+
+    if args.get('q'):
+        query = text_search(query, args['q'])
+
+    sort = args.get('sort', 'id')
+    descending = sort.startswith('-')
+    column = SORT_FIELDS.get(sort.lstrip('-'))
+    if column is None:
+        raise CatalogError(f"Invalid sort field: {sort.lstrip('-')}")
+
+    # id додається як tie-breaker, щоб курсор був однозначним
+    columns = [column] if column is Asset.id else [column, Asset.id]
+    return query, columns, descending
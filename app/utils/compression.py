@@ -0,0 +1,76 @@
+import gzip
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # Brotli є в requirements.txt; без нього лишається gzip
+    brotli = None
+
+ETAG_SUFFIXES = {'gzip': '-gzip', 'br': '-br'}
+
+
+def _choose_encoding(accept_encodings):
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def _compress_stream(chunks, encoding, level):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=min(level, 11))
+        finish = compressor.finish
+        compress = compressor.process
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        finish = compressor.flush
+        compress = compressor.compress
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        data = compress(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+def register_compression(app):
+    """
+    Стиснення JSON-відповідей (br, якщо встановлено brotli, інакше gzip).
+    Потокові відповіді стискаються на льоту, без буферизації всього тіла.
+    """
+
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code != 200
+                or response.mimetype != 'application/json'
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = _choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        level = app.config.get('COMPRESS_LEVEL', 6)
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, encoding, level)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < app.config.get('COMPRESS_MIN_SIZE', 1024):
+                return response
+            if encoding == 'br':
+                response.set_data(brotli.compress(data, quality=min(level, 11)))
+            else:
+                response.set_data(gzip.compress(data, compresslevel=level))
+
+        response.headers['Content-Encoding'] = encoding
+        # Стиснений варіант — інше представлення, тож і strong ETag має відрізнятись
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(etag + ETAG_SUFFIXES[encoding], weak=weak)
+        return response
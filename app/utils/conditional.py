@@ -0,0 +1,67 @@
+import hashlib
+from email.utils import formatdate
+from functools import wraps
+
+from flask import make_response, request
+from flask_jwt_extended import get_jwt_identity
+from werkzeug.http import parse_date
+
+from app.utils.compression import ETAG_SUFFIXES
+from app.utils.replicas import STICKY_COOKIE
+from app.utils.versions import table_versions
+
+
+def _compute_etag(versions):
+    parts = [
+        str(get_jwt_identity()),
+        request.full_path,
+    ] + [f"{table}:{version}" for table, (version, _) in versions.items()]
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+
+def _matching_etag(etag, modified):
+    """
+    ETag, який підтверджує клієнт, або None, якщо треба віддати повну відповідь.
+    """
+    if request.cookies.get(STICKY_COOKIE):
+        # Щойно після запису клієнт завжди отримує повну відповідь
+        return None
+    if request.if_none_match:
+        # Клієнт міг отримати стиснений варіант із суфіксом кодування
+        candidates = [etag] + [etag + suffix for suffix in ETAG_SUFFIXES.values()]
+        return next((tag for tag in candidates if request.if_none_match.contains(tag)), None)
+    since = parse_date(request.headers.get('If-Modified-Since'))
+    if since is not None and int(modified) <= since.timestamp():
+        return etag
+    return None
+
+
+def conditional(*tables):
+    """
+    Умовний GET: ETag і Last-Modified будуються з версій таблиць у БД (один запит
+    до table_versions), тож 304 повертається без запитів до рядків і без серіалізації JSON.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return fn(*args, **kwargs)
+
+            versions = table_versions(*tables)
+            etag = _compute_etag(versions)
+            modified = max(changed for _, changed in versions.values())
+            matched = _matching_etag(etag, modified)
+            if matched:
+                response = make_response('', 304)
+                etag = matched
+            else:
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.headers['Last-Modified'] = formatdate(modified, usegmt=True)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models import Asset, Rental, FinancialSummary
+from app.utils.cache import TTLCache
+from app.utils.serializers import asset_rows, dump_asset
+from app.utils.versions import get_version
+
+# Спільний для всіх користувачів блок доступних об'єктів. Ключ містить версію
+# таблиці assets з БД, тож запис в assets у будь-якому воркері робить старий
+# запис неактуальним; TTL лише звільняє пам'ять.
+_assets_cache = TTLCache(maxsize=4, ttl=30)
+
+
+def available_assets():
+    key = ('available_assets', get_version('assets'))
+    data = _assets_cache.get(key)
+    if data is None:
+        rows = asset_rows(Asset.query.filter_by(status='Доступно')).order_by(Asset.id).all()
+        data = [dump_asset(row) for row in rows]
+        _assets_cache.set(key, data)
+    return data
+
+
+def completed_rentals(user_id):
+    """
+    Завершені оренди рахуються індексом (user_id, status): статус 'Завершена'
+    ставиться поза API.
+    """
+    return Rental.query.filter_by(user_id=user_id, status='Завершена').count()
+
+
+def monthly_expenses(user_id, now=None):
+    """
+    Сума з останнього FinancialSummary, створеного за останні 30 днів.
+    """
+    since = (now or datetime.utcnow()) - timedelta(days=30)
+    total_cost = (db.session.query(FinancialSummary.total_cost)
+                  .filter(FinancialSummary.user_id == user_id, FinancialSummary.created_at >= since)
+                  .order_by(FinancialSummary.created_at.desc())
+                  .limit(1)
+                  .scalar())
+    return float(total_cost) if total_cost else 0.0
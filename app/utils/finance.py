@@ -0,0 +1,135 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import case, func, extract
+from sqlalchemy.dialects import mysql, sqlite, postgresql
+
+from app.extensions import db
+from app.models import FinancialSummary, Rental
+
+# Оренди, що враховуються у підсумках: скасовані віднімаються при скасуванні
+COUNTED_STATUSES = ('Активний', 'Завершена')
+
+
+def month_bounds(day):
+    period_start = date(day.year, day.month, 1)
+    if day.month == 12:
+        next_month = date(day.year + 1, 1, 1)
+    else:
+        next_month = date(day.year, day.month + 1, 1)
+    return period_start, next_month - timedelta(days=1)
+
+
+def _upsert(values, cost_delta, rentals_delta):
+    table = FinancialSummary.__table__
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == 'mysql':
+        stmt = mysql.insert(table).values(**values)
+        return stmt.on_duplicate_key_update(
+            total_cost=table.c.total_cost + cost_delta,
+            total_rentals=table.c.total_rentals + rentals_delta
+        )
+
+    insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+    stmt = insert(table).values(**values)
+    return stmt.on_conflict_do_update(
+        index_elements=['user_id', 'period_start'],
+        set_={
+            'total_cost': table.c.total_cost + cost_delta,
+            'total_rentals': table.c.total_rentals + rentals_delta,
+        }
+    )
+
+
+def add_rental_to_summary(user_id, rental_date, total_cost, rentals=1):
+    """
+    Атомарно додати оренду (або rentals оренд з сумарною вартістю total_cost) до
+    місячного підсумку (INSERT ... ON DUPLICATE KEY UPDATE / ON CONFLICT DO UPDATE) —
+    без читання рядка, тож паралельні оренди не губляться.
+    """
+    period_start, period_end = month_bounds(rental_date)
+    db.session.execute(_upsert({
+        'user_id': user_id,
+        'period_start': period_start,
+        'period_end': period_end,
+        'total_rentals': rentals,
+        'total_cost': total_cost,
+        'created_at': datetime.utcnow(),
+    }, total_cost, rentals))
+
+
+def remove_rental_from_summary(user_id, rental_date, total_cost):
+    """
+    Атомарно відняти оренду від підсумку; значення не опускаються нижче нуля.
+    Повертає кількість оновлених рядків (0 — підсумку не було).
+    """
+    period_start, _ = month_bounds(rental_date)
+    cost = FinancialSummary.total_cost - total_cost
+    rentals = FinancialSummary.total_rentals - 1
+    return FinancialSummary.query.filter_by(user_id=user_id, period_start=period_start).update({
+        FinancialSummary.total_cost: case((cost < 0, 0.0), else_=cost),
+        FinancialSummary.total_rentals: case((rentals < 0, 0), else_=rentals),
+    }, synchronize_session=False)
+
+
+def expected_summaries():
+    """
+    Підсумки, перераховані з rentals одним GROUP BY:
+    {(user_id, period_start): (total_rentals, total_cost)}.
+    """
+    year = extract('year', Rental.rental_date)
+    month = extract('month', Rental.rental_date)
+    rows = (db.session.query(
+                Rental.user_id, year, month,
+                func.count(Rental.id), func.coalesce(func.sum(Rental.total_cost), 0.0))
+            .filter(Rental.status.in_(COUNTED_STATUSES))
+            .group_by(Rental.user_id, year, month)
+            .all())
+    return {
+        (user_id, date(int(y), int(m), 1)): (count, float(cost))
+        for user_id, y, m, count, cost in rows
+    }
+
+
+def reconcile_summaries(fix=False, tolerance=0.005):
+    """
+    Порівняти financial_summaries з rentals. Повертає список розбіжностей
+    (user_id, period_start, (rentals, cost) у таблиці, очікувані (rentals, cost)).
+    З fix=True таблиця приводиться до очікуваних значень одним commit.
+    """
+    expected = expected_summaries()
+    actual = {
+        (s.user_id, s.period_start): s
+        for s in FinancialSummary.query.all()
+    }
+
+    drift = []
+    for key in set(expected) | set(actual):
+        want_rentals, want_cost = expected.get(key, (0, 0.0))
+        summary = actual.get(key)
+        have_rentals, have_cost = (summary.total_rentals, summary.total_cost) if summary else (0, 0.0)
+        if have_rentals != want_rentals or abs(have_cost - want_cost) > tolerance:
+            drift.append((key[0], key[1], (have_rentals, have_cost), (want_rentals, want_cost)))
+
+    if fix and drift:
+        inserts, updates = [], []
+        for user_id, period_start, _, (want_rentals, want_cost) in drift:
+            summary = actual.get((user_id, period_start))
+            if summary:
+                updates.append({'id': summary.id, 'total_rentals': want_rentals, 'total_cost': want_cost})
+            else:
+                inserts.append({
+                    'user_id': user_id,
+                    'period_start': period_start,
+                    'period_end': month_bounds(period_start)[1],
+                    'total_rentals': want_rentals,
+                    'total_cost': want_cost,
+                    'created_at': datetime.utcnow(),
+                })
+        if updates:
+            db.session.bulk_update_mappings(FinancialSummary, updates)
+        if inserts:
+            db.session.bulk_insert_mappings(FinancialSummary, inserts)
+        db.session.commit()
+
+    return sorted(drift, key=lambda d: (d[0], d[1]))
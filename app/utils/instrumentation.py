@@ -0,0 +1,109 @@
+"""
+Вимірювання запитів: час обробки, кількість і час SQL-запитів, розмір відповіді
+по ендпоінтах — у /metrics (гістограми Prometheus) і в заголовку Server-Timing.
+SQL довший за SLOW_QUERY_SECONDS пишеться в лог разом з ендпоінтом.
+Потокові відповіді (?stream=1) потрапляють у гістограми, коли віддано все тіло;
+Server-Timing у них покриває лише час до заголовків.
+"""
+import logging
+import time
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.metrics import Histogram, register
+
+slow_query_logger = logging.getLogger('app.slow_query')
+
+request_seconds = register(Histogram(
+    'http_request_duration_seconds', 'Request handling time by endpoint.'))
+request_sql_statements = register(Histogram(
+    'http_request_sql_statements', 'SQL statements executed per request by endpoint.',
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)))
+request_sql_seconds = register(Histogram(
+    'http_request_sql_duration_seconds', 'Total SQL time per request by endpoint.'))
+response_bytes = register(Histogram(
+    'http_response_size_bytes', 'Response body size by endpoint (after compression).',
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)))
+
+
+def _endpoint():
+    return request.endpoint or 'unmatched'
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _start_statement(conn, cursor, statement, parameters, context, executemany):
+    # Час тримаємо в контексті виконання: після помилки він зникає разом з ним
+    context._statement_started = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _finish_statement(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._statement_started
+    if not has_request_context():
+        return
+    g.sql_count = g.get('sql_count', 0) + 1
+    g.sql_seconds = g.get('sql_seconds', 0.0) + elapsed
+    if elapsed >= current_app.config.get('SLOW_QUERY_SECONDS', 0.5):
+        slow_query_logger.warning(
+            "Slow query %.1f ms in %s %s: %s",
+            elapsed * 1000, request.method, _endpoint(), ' '.join(statement.split())[:1000]
+        )
+
+
+def _observe(elapsed, sql_count, sql_seconds, size, status, labels):
+    request_seconds.observe(elapsed, status=status, **labels)
+    request_sql_statements.observe(sql_count, **labels)
+    request_sql_seconds.observe(sql_seconds, **labels)
+    if size is not None:
+        response_bytes.observe(size, **labels)
+
+
+def _observe_stream(chunks, state, started, status, labels):
+    """
+    Пропустити тіло потокової відповіді і записати метрики після останнього шматка.
+    SQL генератора рахується в тому самому g (stream_with_context).
+    """
+    size = 0
+    try:
+        for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+    finally:
+        _observe(time.perf_counter() - started, state.get('sql_count', 0), state.get('sql_seconds', 0.0),
+                 size, status, labels)
+
+
+def register_instrumentation(app):
+    """
+    Реєструвати першим серед after_request, щоб він виконувався останнім:
+    тоді час і розмір враховують стиснення відповіді.
+    """
+    @app.before_request
+    def _start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.get('request_started')
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        endpoint = _endpoint()
+        sql_count = g.get('sql_count', 0)
+        sql_seconds = g.get('sql_seconds', 0.0)
+
+        labels = {'endpoint': endpoint, 'method': request.method}
+        status = str(response.status_code)
+        if response.is_streamed:
+            response.response = _observe_stream(response.iter_encoded(), g._get_current_object(), started, status, labels)
+        else:
+            _observe(elapsed, sql_count, sql_seconds, response.content_length, status, labels)
+
+        if app.config.get('SERVER_TIMING', True):
+            response.headers.add(
+                'Server-Timing',
+                f'app;dur={elapsed * 1000:.1f}, db;dur={sql_seconds * 1000:.1f};desc="{sql_count} queries"'
+            )
+        return response
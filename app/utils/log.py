@@ -0,0 +1,90 @@
+"""
+Логування застосунку налаштовується один раз у create_app. Потоки запитів лише
+кладуть запис у чергу (QueueHandler); форматування в JSON і запис у потік
+виконує окремий потік QueueListener, тож повільний вивід не блокує запити.
+"""
+import atexit
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+_listener = None
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_text or record.exc_info:
+            data["exc"] = record.exc_text or self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record):
+        # Повідомлення збирається вже тут (аргументи можуть змінитися після return),
+        # а traceback лишається окремим полем для JSON-форматера
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+def _start_listener(output):
+    global _listener
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, output, respect_handler_level=False)
+    _listener.start()
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_QueueHandler(log_queue))
+
+
+def configure_logging(app):
+    """
+    Кореневий логер -> QueueHandler -> QueueListener -> stderr.
+    LOG_LEVEL задає рівень, LOG_FORMAT — 'json' або 'text'.
+    """
+    stop_listener()
+
+    output = logging.StreamHandler(sys.stderr)
+    if app.config.get('LOG_FORMAT', 'json') == 'json':
+        output.setFormatter(JSONFormatter())
+    else:
+        output.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+    _start_listener(output)
+    logging.getLogger().setLevel(app.config.get('LOG_LEVEL', 'INFO'))
+
+
+def restart_listener():
+    """
+    Потік слухача не переживає fork: воркер gunicorn запускає власний слухач
+    з новою чергою. Записи, що лишилися в успадкованій копії черги, виведе
+    майстер-процес, тож тут вони не дублюються.
+    """
+    if _listener is not None:
+        _start_listener(*_listener.handlers)
+
+
+@atexit.register
+def stop_listener():
+    """
+    Дописати чергу і зупинити потік слухача.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
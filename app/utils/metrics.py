@@ -0,0 +1,189 @@
+"""
+Метрики процесу у форматі Prometheus (text exposition 0.0.4), без сторонніх
+бібліотек. Кожен воркер віддає власні значення на /metrics.
+"""
+import bisect
+import hmac
+import threading
+import time
+
+from flask import Response, jsonify, request
+from flask_jwt_extended import current_user, verify_jwt_in_request
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.extensions import db
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in sorted(labels.items())) + '}'
+
+
+class Counter:
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.type = 'counter'
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            if not self._values:
+                return [(self.name, {}, 0)]
+            return [(self.name, dict(key), value) for key, value in self._values.items()]
+
+
+class Gauge:
+    """
+    Значення читається викликом fn у момент збору метрик.
+    """
+
+    def __init__(self, name, help, fn):
+        self.name = name
+        self.help = help
+        self.type = 'gauge'
+        self.fn = fn
+
+    def samples(self):
+        value = self.fn()
+        return [] if value is None else [(self.name, {}, value)]
+
+
+class Histogram:
+    def __init__(self, name, help, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.type = 'histogram'
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._series[key] = (counts, total + value)
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            series = [(dict(key), list(counts), total) for key, (counts, total) in self._series.items()]
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                samples.append((f'{self.name}_bucket', dict(labels, le=le), cumulative))
+            samples.append((f'{self.name}_sum', labels, total))
+            samples.append((f'{self.name}_count', labels, cumulative))
+        return samples
+
+
+REGISTRY = []
+
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+def render():
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f'# HELP {metric.name} {metric.help}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        for name, labels, value in metric.samples():
+            lines.append(f'{name}{_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+# --- Пул з'єднань ---
+
+pool_checkout_seconds = register(Histogram(
+    'db_pool_checkout_seconds', 'Time to obtain a connection from the pool, including waiting.'))
+pool_checkout_timeouts = register(Counter(
+    'db_pool_checkout_timeouts_total', 'Checkouts that gave up after pool_timeout.'))
+pool_connects = register(Counter(
+    'db_pool_connections_opened_total', 'New DBAPI connections opened by the pool.'))
+pool_invalidations = register(Counter(
+    'db_pool_invalidations_total', 'Connections invalidated (dropped by the server, failed pre-ping).'))
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool, що вимірює час видачі з'єднання (очікування вільного + відкриття + pre-ping).
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            pool_checkout_timeouts.inc()
+            raise
+        finally:
+            pool_checkout_seconds.observe(time.perf_counter() - started)
+
+
+def _pool_stat(name):
+    # SingletonThreadPool (SQLite у пам'яті) не має лічильників QueuePool
+    def read():
+        fn = getattr(db.engine.pool, name, None)
+        return fn() if fn else None
+    return read
+
+
+register(Gauge('db_pool_size', 'Configured pool size.', _pool_stat('size')))
+register(Gauge('db_pool_checked_out', 'Connections currently checked out.', _pool_stat('checkedout')))
+register(Gauge('db_pool_checked_in', 'Idle connections in the pool.', _pool_stat('checkedin')))
+register(Gauge('db_pool_overflow', 'Connections opened above pool_size.', _pool_stat('overflow')))
+
+
+def configure_pool(app):
+    """
+    Викликається до db.init_app: вмикає інструментований пул, якщо для БД
+    задано параметри пулу (SQLite у пам'яті працює без них).
+    """
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if options:
+        options.setdefault('poolclass', InstrumentedQueuePool)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+
+def register_metrics(app):
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_connection, connection_record):
+        pool_connects.inc()
+
+    @event.listens_for(engine, 'invalidate')
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        pool_invalidations.inc()
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """
+        Доступ — зі статичним токеном збирача (Authorization: Bearer METRICS_TOKEN)
+        або з JWT адміністратора.
+        """
+        token = app.config.get('METRICS_TOKEN')
+        if not (token and hmac.compare_digest(request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode())):
+            verify_jwt_in_request()
+            if not current_user.is_admin:
+                return jsonify({"msg": "Admins only!"}), 403
+        return Response(render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,108 @@
+import base64
+import json
+from collections import namedtuple
+from datetime import date, datetime
+
+from flask import current_app, jsonify, request
+from sqlalchemy import and_, or_
+
+Page = namedtuple('Page', ['items', 'next_cursor', 'total'])
+
+
+class CursorError(ValueError):
+    pass
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column, value):
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(values):
+    raw = json.dumps([_encode_value(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, columns):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise CursorError("Invalid cursor")
+        return [_decode_value(col, v) for col, v in zip(columns, values)]
+    except (ValueError, TypeError) as e:
+        raise CursorError("Invalid cursor") from e
+
+
+def _after_clause(columns, values, descending=False):
+    # (a, b) > (x, y)  ==  a > x OR (a = x AND b > y) — працює з будь-яким діалектом
+    clauses = []
+    for i, column in enumerate(columns):
+        equal = [columns[j] == values[j] for j in range(i)]
+        beyond = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal, beyond))
+    return or_(*clauses)
+
+
+def get_page_args():
+    """
+    Зчитати limit / after / with_total з параметрів запиту.
+    """
+    default = current_app.config.get('PAGE_SIZE_DEFAULT', 100)
+    maximum = current_app.config.get('PAGE_SIZE_MAX', 1000)
+    try:
+        limit = int(request.args.get('limit', default))
+    except ValueError:
+        raise CursorError("Invalid limit")
+    if limit < 1:
+        raise CursorError("Invalid limit")
+    limit = min(limit, maximum)
+    with_total = request.args.get('with_total', '').lower() in ('1', 'true', 'yes')
+    return limit, request.args.get('after'), with_total
+
+
+def paginate(query, columns, descending=False):
+    """
+    Keyset-пагінація: сортування за columns, наступна сторінка — все, що після курсора.
+    Повертає Page(items, next_cursor, total); total рахується лише на запит.
+    """
+    limit, after, with_total = get_page_args()
+
+    total = query.order_by(None).count() if with_total else None
+
+    if after:
+        query = query.filter(_after_clause(columns, decode_cursor(after, columns), descending))
+
+    order = [col.desc() for col in columns] if descending else columns
+    rows = query.order_by(*order).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, col.key) for col in columns])
+
+    return Page(rows, next_cursor, total)
+
+
+def page_response(page, data, status=200):
+    """
+    JSON-відповідь зі сторінкою; курсор і загальна кількість — у заголовках,
+    щоб тіло залишалось у звичному для фронтенду форматі.
+    """
+    response = jsonify(data)
+    response.status_code = status
+    if page.next_cursor:
+        response.headers['X-Next-Cursor'] = page.next_cursor
+    if page.total is not None:
+        response.headers['X-Total-Count'] = str(page.total)
+    return response
@@ -0,0 +1,84 @@
+"""
+Хешування паролів. PASSWORD_HASH_METHOD = 'bcrypt' (вартість — BCRYPT_LOG_ROUNDS)
+або метод Werkzeug ('scrypt', 'pbkdf2:sha256:600000', ...). Старі хеші
+перевіряються за своїм форматом, а після успішного входу перехешовуються,
+якщо метод або вартість змінилися.
+Хешування виконує обмежений пул потоків (PASSWORD_HASH_WORKERS): одночасно
+рахується не більше N хешів на процес, а понад PASSWORD_HASH_QUEUE очікуючих
+запит одразу отримує PasswordBusy замість того, щоб займати потік сервера.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from app.extensions import bcrypt
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+
+class PasswordBusy(RuntimeError):
+    pass
+
+
+def _is_bcrypt(pw_hash):
+    return pw_hash.startswith('$2')
+
+
+def _run(fn, *args):
+    global _executor, _slots
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                workers = current_app.config.get('PASSWORD_HASH_WORKERS', 2)
+                _slots = threading.BoundedSemaphore(workers + current_app.config.get('PASSWORD_HASH_QUEUE', 16))
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+    if not _slots.acquire(blocking=False):
+        raise PasswordBusy("Password hashing queue is full")
+    try:
+        return _executor.submit(fn, *args).result()
+    finally:
+        _slots.release()
+
+
+def _bcrypt_params():
+    return current_app.config.get('BCRYPT_LOG_ROUNDS', 12), current_app.config.get('BCRYPT_HASH_PREFIX', '2b')
+
+
+def hash_password(password):
+    method = current_app.config.get('PASSWORD_HASH_METHOD', 'bcrypt')
+    if method == 'bcrypt':
+        return _run(bcrypt.generate_password_hash, password, *_bcrypt_params()).decode()
+    return _run(generate_password_hash, password, method)
+
+
+def verify_password(pw_hash, password):
+    if _is_bcrypt(pw_hash):
+        return _run(bcrypt.check_password_hash, pw_hash, password)
+    return _run(check_password_hash, pw_hash, password)
+
+
+def _werkzeug_prefix(method):
+    # 'scrypt' -> 'scrypt:32768:8:1': параметри за замовчуванням видно лише в готовому хеші
+    return generate_password_hash('', method).split('$', 1)[0]
+
+
+_prefixes = {}
+
+
+def needs_rehash(pw_hash):
+    """
+    Чи відрізняються метод або вартість хешу від поточних налаштувань.
+    """
+    method = current_app.config.get('PASSWORD_HASH_METHOD', 'bcrypt')
+    if method == 'bcrypt':
+        rounds, prefix = _bcrypt_params()
+        return not pw_hash.startswith(f'${prefix}${rounds:02d}$')
+    if _is_bcrypt(pw_hash):
+        return True
+    if method not in _prefixes:
+        _prefixes[method] = _werkzeug_prefix(method)
+    return pw_hash.split('$', 1)[0] != _prefixes[method]
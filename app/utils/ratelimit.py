@@ -0,0 +1,88 @@
+"""
+Обмеження спроб входу відром токенів у пам'яті процесу: окремо для пари
+(username, IP) і для IP. Спроба без токена відхиляється до запиту в БД і до
+перевірки пароля. Перебір одного логіна з різних адрес обмежує лише пара,
+зате чужі спроби не блокують вхід користувачу з його адреси. Успішний вхід
+повертає токени, тож ліміт витрачають лише невдалі спроби.
+За проксі адресу клієнта дає ProxyFix (PROXY_FIX_X_FOR), інакше всі входи
+рахувалися б на адресу проксі.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenBucket:
+    """
+    burst спроб одразу, далі per_minute на хвилину; для кожного ключа окремо.
+    Найдавніші відра витісняються понад maxsize.
+    """
+
+    def __init__(self, burst, per_minute, maxsize=100000):
+        self.burst = burst
+        self.rate = per_minute / 60.0
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key):
+        """
+        Забрати токен; повертає 0 або скільки секунд чекати до наступного.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0
+            else:
+                wait = (1 - tokens) / self.rate if self.rate else 60
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def give(self, key):
+        """
+        Повернути токен, забраний take (не більше burst).
+        """
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated = self._buckets[key]
+                self._buckets[key] = (min(self.burst, tokens + 1), updated)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+_per_user = TokenBucket(burst=5, per_minute=5)
+_per_ip = TokenBucket(burst=30, per_minute=30)
+
+
+def configure_login_limits(app):
+    _per_user.burst = app.config.get('LOGIN_USER_BURST', 5)
+    _per_user.rate = app.config.get('LOGIN_USER_PER_MINUTE', 5) / 60.0
+    _per_ip.burst = app.config.get('LOGIN_IP_BURST', 30)
+    _per_ip.rate = app.config.get('LOGIN_IP_PER_MINUTE', 30) / 60.0
+    _per_user.clear()
+    _per_ip.clear()
+
+
+def login_retry_after(username, ip):
+    """
+    0, якщо спробу входу дозволено, інакше секунди до наступної дозволеної.
+    """
+    wait = _per_ip.take(ip)
+    if wait:
+        return wait
+    return _per_user.take((username.lower(), ip))
+
+
+def login_succeeded(username, ip):
+    """
+    Повернути токени спроби, що завершилася успішним входом.
+    """
+    _per_ip.give(ip)
+    _per_user.give((username.lower(), ip))
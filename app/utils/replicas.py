@@ -0,0 +1,108 @@
+"""
+Маршрутизація читань на репліки (REPLICA_DATABASE_URIS). Рушії реплік не є binds
+Flask-SQLAlchemy, тож create_all/drop_all і міграції їх не зачіпають.
+На репліку йдуть лише SELECT у GET-запитах, і лише поки сесія нічого не записала;
+блокуючі читання (FOR UPDATE) — завжди на основну БД.
+Після успішного POST/PUT/DELETE клієнт отримує cookie primary_until і до цього
+часу читає з основної (read-your-writes) — у будь-якому воркері, бо стан у cookie,
+а не в пам'яті процесу. Недоступна репліка виключається на REPLICA_RETRY_SECONDS,
+а запит виконується на основній.
+"""
+import itertools
+import threading
+import time
+
+from flask import current_app, request
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from config import engine_options
+
+READ_METHODS = ('GET', 'HEAD')
+STICKY_COOKIE = 'primary_until'
+
+_down_until = {}
+_counter = itertools.count()
+_lock = threading.Lock()
+
+
+def _pinned_to_primary():
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def _pick_replica():
+    engines = current_app.extensions['replicas']
+    now = time.monotonic()
+    healthy = [key for key in engines if _down_until.get(key, 0) <= now]
+    if not healthy:
+        return None
+    key = healthy[next(_counter) % len(healthy)]
+    return key, engines[key]
+
+
+def _mark_down(key):
+    retry = current_app.config.get('REPLICA_RETRY_SECONDS', 30)
+    with _lock:
+        _down_until[key] = time.monotonic() + retry
+    current_app.logger.warning("Replica %s is unavailable, reading from primary for %ss", key, retry)
+
+
+@event.listens_for(Session, 'before_flush')
+def _pin_after_write(session, flush_context, instances):
+    session.info['primary_only'] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _route_reads(state):
+    session = state.session
+    if not state.is_select:
+        if state.is_insert or state.is_update or state.is_delete:
+            session.info['primary_only'] = True
+        return None
+    if not session.info.get('read_replica') or session.info.get('primary_only'):
+        return None
+    if getattr(state.statement, '_for_update_arg', None) is not None:
+        return None
+    if session.new or session.dirty or session.deleted:
+        return None
+
+    picked = _pick_replica()
+    if picked is None:
+        return None
+    key, engine = picked
+    try:
+        return state.invoke_statement(bind_arguments={'bind': engine})
+    except OperationalError:
+        _mark_down(key)
+        return state.invoke_statement()
+
+
+def register_replicas(app):
+    """
+    Увімкнути читання з реплік для GET-запитів, якщо репліки налаштовано.
+    """
+    engines = {
+        f'replica_{i}': create_engine(uri, **engine_options(uri))
+        for i, uri in enumerate(app.config.get('REPLICA_DATABASE_URIS') or [])
+    }
+    app.extensions['replicas'] = engines
+    if not engines:
+        return
+
+    @app.before_request
+    def _use_replica():
+        if request.method in READ_METHODS and not _pinned_to_primary():
+            db.session.info['read_replica'] = True
+
+    @app.after_request
+    def _stick_to_primary(response):
+        if request.method not in READ_METHODS and response.status_code < 400:
+            sticky = app.config.get('REPLICA_STICKY_SECONDS', 5)
+            response.set_cookie(STICKY_COOKIE, f'{time.time() + sticky:.3f}', max_age=sticky,
+                                httponly=True, samesite='Lax', secure=request.is_secure)
+        return response
@@ -0,0 +1,173 @@
+from datetime import date, timedelta
+
+from sqlalchemy import func
+
+from app.extensions import db
+from app.models import Asset, Rental
+from app.utils.cache import TTLCache
+from app.utils.finance import COUNTED_STATUSES, month_bounds
+
+GRANULARITIES = ('day', 'week', 'month')
+MAX_PERIODS = 400
+
+# Звіт за конкретний діапазон: ключ містить відбиток оренд користувача
+_reports = TTLCache(maxsize=256, ttl=30)
+# Закриті періоди (кінець у минулому) запам'ятовуються з відбитком оренд користувача
+# з БД (_rentals_stamp): бронювання чи скасування в будь-якому процесі змінює
+# відбиток, і старі записи просто перестають збігатися.
+# Розбивка by_type бере тип об'єкта на момент обчислення періоду.
+_closed_periods = TTLCache(maxsize=20000, ttl=24 * 3600)
+
+
+class ReportError(ValueError):
+    pass
+
+
+def period_start(day, granularity):
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return date(day.year, day.month, 1)
+    return day
+
+
+def period_end(start, granularity):
+    if granularity == 'week':
+        return start + timedelta(days=6)
+    if granularity == 'month':
+        return month_bounds(start)[1]
+    return start
+
+
+def _periods(start, end, granularity):
+    periods = []
+    current = period_start(start, granularity)
+    while current <= end:
+        periods.append(current)
+        if len(periods) > MAX_PERIODS:
+            raise ReportError(f"Range is too large: at most {MAX_PERIODS} periods per report")
+        current = period_end(current, granularity) + timedelta(days=1)
+    return periods
+
+
+def _bucket(granularity):
+    """
+    Вираз початку періоду для GROUP BY: тиждень починається з понеділка.
+    """
+    if granularity == 'day':
+        return Rental.rental_date
+    if db.session.get_bind().dialect.name == 'mysql':
+        if granularity == 'week':
+            return func.subdate(Rental.rental_date, func.weekday(Rental.rental_date))
+        return func.date_format(Rental.rental_date, '%Y-%m-01')
+    if granularity == 'week':
+        return func.date(Rental.rental_date, '-6 days', 'weekday 1')
+    return func.strftime('%Y-%m-01', Rental.rental_date)
+
+
+def _as_date(value):
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _empty_period(start, granularity):
+    return {
+        'period_start': start,
+        'period_end': period_end(start, granularity),
+        'rentals': 0,
+        'revenue': 0.0,
+        'by_type': {},
+    }
+
+
+def _rentals_stamp(user_id):
+    """
+    (кількість, максимальний id, сума) врахованих оренд користувача: змінюється
+    при кожному бронюванні та скасуванні, хоч би який процес їх виконав.
+    """
+    count, last_id, revenue = (db.session.query(
+            func.count(Rental.id), func.max(Rental.id), func.sum(Rental.total_cost))
+        .filter(Rental.user_id == user_id, Rental.status.in_(COUNTED_STATUSES))
+        .one())
+    return count, last_id, round(revenue or 0.0, 2)
+
+
+def _query_periods(user_id, granularity, start, end):
+    """
+    Один GROUP BY (період, тип об'єкта) по rentals за [start, end].
+    """
+    bucket = _bucket(granularity).label('bucket')
+    rows = (db.session.query(
+                bucket, Asset.type,
+                func.count(Rental.id), func.coalesce(func.sum(Rental.total_cost), 0.0))
+            .join(Asset, Asset.id == Rental.asset_id)
+            .filter(
+                Rental.user_id == user_id,
+                Rental.status.in_(COUNTED_STATUSES),
+                Rental.rental_date >= start,
+                Rental.rental_date <= end)
+            .group_by(bucket, Asset.type)
+            .all())
+
+    periods = {}
+    for value, asset_type, count, revenue in rows:
+        key = _as_date(value)
+        period = periods.setdefault(key, _empty_period(key, granularity))
+        period['rentals'] += count
+        period['revenue'] += float(revenue)
+        period['by_type'][asset_type] = {'rentals': count, 'revenue': float(revenue)}
+    return periods
+
+
+def financial_report(user_id, granularity, start, end, today=None):
+    """
+    Звіт з доходами та кількістю оренд по періодах і типах об'єктів.
+    Межі розширюються до цілих періодів; рахується одним запитом, закриті
+    періоди беруться з пам'яті, поки не змінився відбиток оренд користувача.
+    """
+    if granularity not in GRANULARITIES:
+        raise ReportError(f"granularity must be one of: {', '.join(GRANULARITIES)}")
+    if end < start:
+        raise ReportError("'to' must not be before 'from'")
+
+    today = today or date.today()
+    starts = _periods(start, end, granularity)
+    start, end = starts[0], period_end(starts[-1], granularity)
+
+    stamp = _rentals_stamp(user_id)
+    key = (user_id, granularity, start, end, stamp)
+    report = _reports.get(key)
+    if report is not None:
+        return report
+
+    periods = {}
+    missing = []
+    for period in starts:
+        memo = _closed_periods.get((user_id, granularity, period, stamp))
+        if memo is not None:
+            periods[period] = memo
+        else:
+            missing.append(period)
+
+    if missing:
+        fetched = _query_periods(user_id, granularity, missing[0], period_end(missing[-1], granularity))
+        for period in missing:
+            data = fetched.get(period) or _empty_period(period, granularity)
+            periods[period] = data
+            if data['period_end'] < today:
+                _closed_periods.set((user_id, granularity, period, stamp), data)
+
+    report = {
+        'granularity': granularity,
+        'from': start,
+        'to': end,
+        'total': {
+            'rentals': sum(periods[p]['rentals'] for p in starts),
+            'revenue': round(sum(periods[p]['revenue'] for p in starts), 2),
+        },
+        'periods': [periods[p] for p in starts],
+    }
+    _reports.set(key, report)
+    return report
+
@@ -0,0 +1,113 @@
+"""
+Серіалізатори моделей: запити вибирають лише потрібні колонки як кортежі рядків
+(без identity map і повних ORM-об'єктів), а dump_* перетворює рядок у dict.
+Дати лишаються об'єктами date/datetime — їх форматує JSON-провайдер застосунку.
+"""
+from app.models import User, Asset, Rental, StatusHistory, FinancialSummary
+
+USER_COLUMNS = (User.id, User.username, User.email, User.is_admin)
+
+ASSET_COLUMNS = (
+    Asset.id, Asset.name, Asset.type, Asset.description, Asset.status,
+    Asset.price_per_day, Asset.created_at, Asset.updated_at,
+)
+
+RENTAL_COLUMNS = (
+    Rental.id, Rental.asset_id, Asset.name.label('asset_name'), Rental.user_id, User.username,
+    Rental.rental_date, Rental.end_date, Rental.total_cost, Rental.status,
+)
+
+STATUS_HISTORY_COLUMNS = (
+    StatusHistory.id, StatusHistory.asset_id, StatusHistory.previous_status,
+    StatusHistory.new_status, StatusHistory.changed_at,
+)
+
+FINANCIAL_SUMMARY_COLUMNS = (
+    FinancialSummary.id, FinancialSummary.user_id, FinancialSummary.period_start,
+    FinancialSummary.period_end, FinancialSummary.total_rentals, FinancialSummary.total_cost,
+    FinancialSummary.created_at,
+)
+
+
+def user_rows(query):
+    return query.with_entities(*USER_COLUMNS)
+
+
+def asset_rows(query):
+    return query.with_entities(*ASSET_COLUMNS)
+
+
+def rental_rows(query):
+    """
+    Назва об'єкта та ім'я користувача приєднуються в тому ж SELECT.
+    """
+    return (query
+            .join(Asset, Rental.asset_id == Asset.id)
+            .join(User, Rental.user_id == User.id)
+            .with_entities(*RENTAL_COLUMNS))
+
+
+def status_history_rows(query):
+    return query.with_entities(*STATUS_HISTORY_COLUMNS)
+
+
+def financial_summary_rows(query):
+    return query.with_entities(*FINANCIAL_SUMMARY_COLUMNS)
+
+
+def dump_user(row):
+    return {
+        "id": row.id,
+        "username": row.username,
+        "email": row.email,
+        "is_admin": row.is_admin
+    }
+
+
+def dump_asset(row):
+    return {
+        "id": row.id,
+        "name": row.name,
+        "type": row.type,
+        "description": row.description,
+        "status": row.status,
+        "price_per_day": row.price_per_day,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at
+    }
+
+
+def dump_rental(row):
+    return {
+        "id": row.id,
+        "asset_id": row.asset_id,
+        "asset_name": row.asset_name,
+        "user_id": row.user_id,
+        "username": row.username,
+        "start_date": row.rental_date,
+        "end_date": row.end_date,
+        "total_cost": row.total_cost or None,
+        "status": row.status
+    }
+
+
+def dump_status_history(row):
+    return {
+        "id": row.id,
+        "asset_id": row.asset_id,
+        "previous_status": row.previous_status,
+        "new_status": row.new_status,
+        "changed_at": row.changed_at
+    }
+
+
+def dump_financial_summary(row):
+    return {
+        "id": row.id,
+        "user_id": row.user_id,
+        "period_start": row.period_start,
+        "period_end": row.period_end,
+        "total_rentals": row.total_rentals,
+        "total_cost": row.total_cost,
+        "created_at": row.created_at
+    }
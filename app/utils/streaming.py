@@ -0,0 +1,29 @@
+from flask import Response, current_app, request, stream_with_context
+
+
+def wants_stream():
+    return request.args.get('stream', '').lower() in ('1', 'true', 'yes')
+
+
+def stream_json(query, serialize, chunk_rows=500):
+    """
+    Віддати JSON-масив частинами: рядки читаються серверним курсором (yield_per),
+    тож пам'ять не залежить від розміру вибірки, а перший байт іде одразу.
+    """
+    dumps = current_app.json.dumps
+
+    def generate():
+        yield '['
+        buffer = []
+        first = True
+        for row in query.yield_per(chunk_rows):
+            buffer.append(dumps(serialize(row)))
+            if len(buffer) >= chunk_rows:
+                yield ('' if first else ',') + ','.join(buffer)
+                first = False
+                buffer = []
+        if buffer:
+            yield ('' if first else ',') + ','.join(buffer)
+        yield ']'
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
@@ -0,0 +1,99 @@
+"""
+Версії таблиць зберігаються в БД (table_versions): commit, що змінив рядки таблиці,
+одразу після себе збільшує її версію короткою окремою транзакцією. Тож версію,
+а з нею ETag і ключі кешу, бачать однаково всі воркери, і до відповіді на запис
+вона вже нова (read-your-writes).
+"""
+import calendar
+from datetime import datetime
+
+from flask import g, has_app_context
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import TableVersion
+
+_table = TableVersion.__table__
+
+
+def table_versions(*tables):
+    """
+    {таблиця: (версія, час зміни в unix time)} одним запитом; у межах запиту
+    (контексту застосунку) прочитане запам'ятовується до наступного commit.
+    """
+    known = g.setdefault('table_versions', {}) if has_app_context() else {}
+    missing = [table for table in tables if table not in known]
+    if missing:
+        rows = db.session.execute(
+            select(_table.c.name, _table.c.version, _table.c.updated_at).where(_table.c.name.in_(missing))
+        ).all()
+        found = {name: (version, calendar.timegm(updated_at.utctimetuple())) for name, version, updated_at in rows}
+        for table in missing:
+            known[table] = found.get(table, (0, 0))
+    return {table: known[table] for table in tables}
+
+
+def get_version(table):
+    return table_versions(table)[table][0]
+
+
+def last_modified(*tables):
+    """
+    Час останньої зміни будь-якої з таблиць (unix time), 0 — якщо змін ще не було.
+    """
+    return max([modified for _, modified in table_versions(*tables).values()] or [0])
+
+
+def bump(engine, *tables):
+    now = datetime.utcnow()
+    with engine.connect() as conn:
+        # Сталий порядок — щоб паралельні commit не блокували одне одного навхрест
+        for table in sorted(tables):
+            increment = (update(_table).where(_table.c.name == table)
+                         .values(version=_table.c.version + 1, updated_at=now))
+            if not conn.execute(increment).rowcount:
+                try:
+                    conn.execute(insert(_table).values(name=table, version=1, updated_at=now))
+                except IntegrityError:
+                    # Рядок щойно вставив інший процес
+                    conn.rollback()
+                    conn.execute(increment)
+            conn.commit()
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changed_tables(session, flush_context):
+    changed = session.info.setdefault('changed_tables', set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, '__tablename__', None)
+        if table:
+            changed.add(table)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_changes(orm_execute_state):
+    # query.update() / query.delete() та INSERT/UPSERT через session.execute оминають flush
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        mapper = state.bind_mapper
+        table = mapper.local_table if mapper is not None else getattr(state.statement, 'table', None)
+        if table is not None:
+            state.session.info.setdefault('changed_tables', set()).add(table.name)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_changed_tables(session):
+    changed = session.info.pop('changed_tables', None)
+    if has_app_context():
+        g.pop('table_versions', None)
+    if changed:
+        changed.discard(_table.name)
+        if changed:
+            bump(session.get_bind(), *changed)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_tables(session):
+    session.info.pop('changed_tables', None)
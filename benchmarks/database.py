@@ -0,0 +1,19 @@
+"""
+База для бенчмарків. Вони видаляють і заповнюють таблиці, тому DATABASE_URI з
+оточення (можливо, робочої бази) ніколи не використовується: лише окрема
+BENCH_DATABASE_URI або тимчасова SQLite. Викликати до імпорту app.
+"""
+import os
+import tempfile
+
+
+def use_bench_database(name=None):
+    """
+    Підставити базу бенчмарку в DATABASE_URI; name — файл тимчасової SQLite,
+    без name — SQLite у пам'яті.
+    """
+    uri = os.environ.get('BENCH_DATABASE_URI')
+    if not uri:
+        uri = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), f'{name}.db') if name else 'sqlite://'
+    os.environ['DATABASE_URI'] = uri
+    return uri
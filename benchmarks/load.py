@@ -0,0 +1,161 @@
+"""
+Навантажувальний тест: запускає застосунок у різних режимах і порівнює
+запити/с та затримки (p50/p99) на тих самих ендпоінтах.
+
+    python -m benchmarks.load --modes dev gunicorn --concurrency 32 --duration 10
+    python -m benchmarks.load --url http://localhost:8000 --token <JWT>   # вже запущений сервер
+
+Режими: dev (вбудований сервер Flask, як у run.py), gunicorn (gunicorn.conf.py),
+waitress (python wsgi.py). Запущені режими працюють з BENCH_DATABASE_URI або
+тимчасовою SQLite; з --url база не чіпається, потрібен токен наявного користувача.
+"""
+import argparse
+import http.client
+import os
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from benchmarks.database import use_bench_database
+
+use_bench_database('load')
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import User, Asset  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ['/', '/objects/?limit=50', '/dashboard/', '/rentals/?limit=50']
+
+COMMANDS = {
+    'dev': [sys.executable, '-c',
+            'import os, run; run.app.run(port=int(os.environ["PORT"]), debug=True, use_reloader=False)'],
+    'gunicorn': [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+    'waitress': [sys.executable, 'wsgi.py'],
+}
+
+
+def seed(assets):
+    user = User(username='load', email='load@example.com', password_hash='-', is_admin=True)
+    db.session.add(user)
+    db.session.commit()
+    db.session.execute(Asset.__table__.insert(), [{
+        'user_id': user.id,
+        'name': f'asset {i}',
+        'type': 'car',
+        'price_per_day': 10.0,
+        'status': 'Доступно',
+    } for i in range(assets)])
+    db.session.commit()
+    return create_access_token(identity=str(user.id))
+
+
+def wait_for(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request('GET', '/')
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on {host}:{port} did not start")
+
+
+def client(host, port, path, headers, stop_at, latencies, errors):
+    # Одне keep-alive з'єднання на потік, як у браузера чи проксі
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    while time.monotonic() < stop_at:
+        started = time.perf_counter()
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException):
+            errors.append(None)
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - started)
+    conn.close()
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+def run_load(url, token, concurrency, duration):
+    parts = urlsplit(url)
+    headers = {'Authorization': f'Bearer {token}'}
+    results = []
+    for path in ENDPOINTS:
+        latencies, errors = [], []
+        stop_at = time.monotonic() + duration
+        threads = [
+            threading.Thread(target=client, args=(parts.hostname, parts.port, path, headers, stop_at, latencies, errors))
+            for _ in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        results.append((path, len(latencies) / duration, percentile(latencies, 0.5),
+                        percentile(latencies, 0.99), len(errors)))
+    return results
+
+
+def serve(mode, port):
+    env = dict(os.environ, PORT=str(port), HOST='127.0.0.1')
+    return subprocess.Popen(COMMANDS[mode], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--modes', nargs='+', choices=sorted(COMMANDS), default=['dev', 'gunicorn'])
+    parser.add_argument('--url', help='Тестувати вже запущений сервер замість запуску режимів')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--assets', type=int, default=500)
+    parser.add_argument('--token', help='JWT користувача для --url')
+    args = parser.parse_args()
+
+    if args.url:
+        if not args.token:
+            parser.error('--url requires --token')
+        token = args.token
+    else:
+        app = create_app()
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            token = seed(args.assets)
+
+    targets = [('external', args.url)] if args.url else [(mode, f'http://127.0.0.1:{args.port}') for mode in args.modes]
+    for mode, url in targets:
+        process = None if args.url else serve(mode, args.port)
+        try:
+            parts = urlsplit(url)
+            wait_for(parts.hostname, parts.port)
+            results = run_load(url, token, args.concurrency, args.duration)
+        finally:
+            if process:
+                process.terminate()
+                process.wait()
+
+        print(f"{mode}: {args.concurrency} connections x {args.duration:g}s per endpoint")
+        for path, rps, p50, p99, errors in results:
+            print(f"  {path:24} {rps:8,.0f} req/s  p50 {p50 * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms  errors {errors}")
+
+
+if __name__ == '__main__':
+    main()
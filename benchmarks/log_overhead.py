@@ -0,0 +1,104 @@
+"""
+Вартість логування на запит: синхронний StreamHandler (як давав basicConfig)
+проти QueueHandler/QueueListener з app.utils.log, плюс ціна f-рядків
+у вимкнених викликах logger.debug.
+
+    python -m benchmarks.log_overhead --requests 2000 --sink-delay 0.0002
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+import timeit
+
+from benchmarks.database import use_bench_database
+
+use_bench_database()
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import User, Asset  # noqa: E402
+
+
+class SlowFileHandler(logging.FileHandler):
+    """
+    Файл із затримкою на кожен запис — імітує повільний диск/мережевий збирач логів.
+    """
+
+    def __init__(self, path, delay):
+        super().__init__(path)
+        self.sink_delay = delay
+
+    def emit(self, record):
+        if self.sink_delay:
+            time.sleep(self.sink_delay)
+        super().emit(record)
+
+
+def seed():
+    user = User(username='log', email='log@example.com', password_hash='-', is_admin=True)
+    db.session.add(user)
+    db.session.commit()
+    db.session.add_all([Asset(user_id=user.id, name=f'asset {i}', type='car', price_per_day=10.0) for i in range(50)])
+    db.session.commit()
+    return create_access_token(identity=str(user.id))
+
+
+def drive(app, headers, requests):
+    client = app.test_client()
+    started = time.perf_counter()
+    for i in range(requests):
+        client.get(f'/objects/{i % 50 + 1}', headers=headers)
+        client.get('/objects/100000', headers=headers)  # 404 з warning
+    return (time.perf_counter() - started) / (requests * 2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--sink-delay', type=float, default=0.0002, help='Секунд на запис у «повільний» вихід')
+    args = parser.parse_args()
+    sink = os.path.join(tempfile.mkdtemp(), 'app.log')
+
+    app = create_app()
+    app.config['SERVER_TIMING'] = False
+    with app.app_context():
+        db.create_all()
+        headers = {'Authorization': f'Bearer {seed()}'}
+
+    # Після: черга, вихід у повільний файл обробляє потік слухача
+    from app.utils import log
+    log._listener.handlers = (SlowFileHandler(sink, args.sink_delay),)
+    queued = drive(app, headers, args.requests)
+
+    # До: синхронний обробник на кореневому логері
+    log.stop_listener()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    sync_handler = SlowFileHandler(sink, args.sink_delay)
+    sync_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    root.addHandler(sync_handler)
+    synchronous = drive(app, headers, args.requests)
+
+    print(f"per request, sink delay {args.sink_delay * 1e6:.0f} us/record:")
+    print(f"  synchronous handler: {synchronous * 1e6:8.1f} us")
+    print(f"  queue handler:       {queued * 1e6:8.1f} us")
+
+    # Вимкнений рівень: f-рядок форматується завжди, %-аргументи — ні
+    logger = logging.getLogger('bench')
+    logger.setLevel(logging.INFO)
+    data = {'id': 1, 'username': 'x', 'email': 'x@example.com', 'is_admin': False}
+    n = 200000
+    eager = timeit.timeit(lambda: logger.debug(f"User profile retrieved: {data}"), number=n) / n
+    lazy = timeit.timeit(lambda: logger.debug("User profile retrieved: %s", data), number=n) / n
+    print("disabled logger.debug call:")
+    print(f"  f-string:  {eager * 1e9:6.0f} ns")
+    print(f"  %-args:    {lazy * 1e9:6.0f} ns")
+
+
+if __name__ == '__main__':
+    main()
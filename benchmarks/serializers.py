@@ -0,0 +1,87 @@
+"""
+Порівняння серіалізації списку оренд: ORM-об'єкти + ручні dict + stdlib json
+проти кортежів колонок (app.utils.serializers) + JSON-провайдера застосунку.
+
+    python -m benchmarks.serializers --rows 10000
+"""
+import argparse
+import json
+import time
+from datetime import date, timedelta
+
+from benchmarks.database import use_bench_database
+
+use_bench_database()
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import User, Asset, Rental  # noqa: E402
+from app.utils.serializers import rental_rows, dump_rental  # noqa: E402
+
+
+def seed(rows):
+    user = User(username='bench', email='bench@example.com', password_hash='-')
+    db.session.add(user)
+    db.session.flush()
+    assets = [Asset(user_id=user.id, name=f'asset {i}', type='car', price_per_day=10.0) for i in range(100)]
+    db.session.add_all(assets)
+    db.session.flush()
+    start = date(2024, 1, 1)
+    db.session.execute(Rental.__table__.insert(), [{
+        'user_id': user.id,
+        'asset_id': assets[i % len(assets)].id,
+        'rental_date': start + timedelta(days=i % 365),
+        'end_date': start + timedelta(days=i % 365 + 3),
+        'total_cost': 30.0,
+        'status': 'Активний',
+    } for i in range(rows)])
+    db.session.commit()
+
+
+def orm_dicts():
+    rentals = Rental.query.all()
+    data = [{
+        "id": rental.id,
+        "asset_id": rental.asset_id,
+        "asset_name": rental.asset.name,
+        "user_id": rental.user_id,
+        "username": rental.user.username,
+        "start_date": rental.rental_date.isoformat(),
+        "end_date": rental.end_date.isoformat() if rental.end_date else None,
+        "total_cost": float(rental.total_cost) if rental.total_cost else None,
+        "status": rental.status
+    } for rental in rentals]
+    return json.dumps(data)
+
+
+def row_tuples(app):
+    data = [dump_rental(row) for row in rental_rows(Rental.query).all()]
+    return app.json.dumps(data)
+
+
+def measure(name, fn, rows, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    print(f"{name:28} {best * 1000:8.1f} ms  {rows / best:12,.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(args.rows)
+        measure('ORM + dict + json', orm_dicts, args.rows, args.repeat)
+        measure('rows + dump_* + provider', lambda: row_tuples(app), args.rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,8 @@ import axios from 'axios';
 
 const instance = axios.create({
   baseURL: 'http://localhost:5000',
+  // cookie primary_until: після запису читання йдуть з основної БД, а не з репліки
+  withCredentials: true,
 });
 
 instance.interceptors.request.use(
@@ -17,4 +19,15 @@ instance.interceptors.request.use(
   }
 );
 
+// Списки віддаються сторінками: наступна сторінка — за курсором із заголовка X-Next-Cursor.
+// Перегляди показують першу сторінку і довантажують наступні на вимогу.
+export const PAGE_SIZE = 50;
+
+export async function getPage(url, params = {}, after = null) {
+  const response = await instance.get(url, {
+    params: after ? { ...params, limit: PAGE_SIZE, after } : { ...params, limit: PAGE_SIZE },
+  });
+  return { items: response.data, next: response.headers['x-next-cursor'] || null };
+}
+
 export default instance;
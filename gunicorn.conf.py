@@ -0,0 +1,38 @@
+"""
+Налаштування gunicorn: gunicorn -c gunicorn.conf.py wsgi:app
+Усі значення можна перевизначити змінними оточення.
+"""
+import multiprocessing
+import os
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 8000)}"
+
+# Процеси для CPU, потоки — для очікування на БД
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Перезапуск воркерів після N запитів (з розкидом, щоб не всі одночасно)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+# create_app виконується один раз у майстрі до fork
+preload_app = True
+
+
+def post_fork(server, worker):
+    # З'єднання пулу не можна ділити між процесами, а потік логування — свій
+    # у кожного воркера
+    from app.extensions import db
+    from app.utils.log import restart_listener
+
+    restart_listener()
+    app = server.app.wsgi()
+    with app.app_context():
+        db.engine.dispose(close=False)
+    for engine in app.extensions.get('replicas', {}).values():
+        engine.dispose(close=False)
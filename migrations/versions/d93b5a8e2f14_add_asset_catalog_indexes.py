@@ -0,0 +1,39 @@
+"""Add asset catalog indexes (status/type/price, FULLTEXT on name/description)
+
+Revision ID: d93b5a8e2f14
+Revises: b47e0c9d1a25
+Create Date: 2026-10-18 14:31:09.227841
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd93b5a8e2f14'
+down_revision = 'b47e0c9d1a25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('assets', schema=None) as batch_op:
+        batch_op.create_index('ix_assets_status_type_price', ['status', 'type', 'price_per_day'], unique=False)
+        batch_op.create_index('ix_assets_type_price', ['type', 'price_per_day'], unique=False)
+        # (status, type, price_per_day) покриває запити, що йшли по ix_assets_status
+        batch_op.drop_index('ix_assets_status')
+
+    # FULLTEXT-індекс підтримує лише MySQL; на інших БД пошук іде через LIKE
+    if op.get_bind().dialect.name == 'mysql':
+        op.create_index('ix_assets_name_description_fulltext', 'assets', ['name', 'description'],
+                        unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'mysql':
+        op.drop_index('ix_assets_name_description_fulltext', table_name='assets')
+
+    with op.batch_alter_table('assets', schema=None) as batch_op:
+        batch_op.create_index('ix_assets_status', ['status'], unique=False)
+        batch_op.drop_index('ix_assets_type_price')
+        batch_op.drop_index('ix_assets_status_type_price')
@@ -0,0 +1,63 @@
+"""Make financial_summaries unique per (user_id, period_start)
+
+Revision ID: e61f7c2a9d38
+Revises: d93b5a8e2f14
+Create Date: 2026-10-18 15:02:44.871530
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e61f7c2a9d38'
+down_revision = 'd93b5a8e2f14'
+branch_labels = None
+depends_on = None
+
+
+def _merge_duplicates():
+    # Дублікати (user_id, period_start) зливаються в рядок з найменшим id
+    bind = op.get_bind()
+    summaries = sa.table(
+        'financial_summaries',
+        sa.column('id', sa.Integer),
+        sa.column('user_id', sa.Integer),
+        sa.column('period_start', sa.Date),
+        sa.column('total_rentals', sa.Integer),
+        sa.column('total_cost', sa.Float),
+    )
+    duplicates = bind.execute(
+        sa.select(
+            summaries.c.user_id, summaries.c.period_start, sa.func.min(summaries.c.id),
+            sa.func.sum(summaries.c.total_rentals), sa.func.sum(summaries.c.total_cost)
+        )
+        .group_by(summaries.c.user_id, summaries.c.period_start)
+        .having(sa.func.count() > 1)
+    ).all()
+    for user_id, period_start, keep_id, total_rentals, total_cost in duplicates:
+        bind.execute(
+            summaries.update().where(summaries.c.id == keep_id)
+            .values(total_rentals=total_rentals, total_cost=total_cost)
+        )
+        bind.execute(
+            summaries.delete().where(
+                summaries.c.user_id == user_id,
+                summaries.c.period_start == period_start,
+                summaries.c.id != keep_id
+            )
+        )
+
+
+def upgrade():
+    _merge_duplicates()
+
+    with op.batch_alter_table('financial_summaries', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_financial_summaries_user_id_period_start', ['user_id', 'period_start'])
+        batch_op.drop_index('ix_financial_summaries_user_id_period_start')
+
+
+def downgrade():
+    with op.batch_alter_table('financial_summaries', schema=None) as batch_op:
+        batch_op.create_index('ix_financial_summaries_user_id_period_start', ['user_id', 'period_start'], unique=False)
+        batch_op.drop_constraint('uq_financial_summaries_user_id_period_start', type_='unique')
@@ -0,0 +1,105 @@
+import os
+from datetime import date, timedelta
+from importlib.metadata import version
+
+import pytest
+import werkzeug
+
+os.environ['DATABASE_URI'] = 'sqlite://'
+os.environ.setdefault('BCRYPT_LOG_ROUNDS', '4')
+
+# Flask 2.3 читає werkzeug.__version__, якого Werkzeug 3.1 більше не має
+if not hasattr(werkzeug, '__version__'):
+    werkzeug.__version__ = version('werkzeug')
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db as _db  # noqa: E402
+from app.models import User, Asset, Rental  # noqa: E402
+from app.utils import dashboard, reports  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    dashboard._assets_cache.clear()
+    reports._reports.clear()
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        _db.create_all()
+        yield app
+        _db.session.remove()
+        _db.drop_all()
+
+
+@pytest.fixture
+def db(app):
+    return _db
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def make_user(username, is_admin=False, password='secret'):
+    user = User(username=username, email=f'{username}@example.com', is_admin=is_admin)
+    user.set_password(password)
+    _db.session.add(user)
+    _db.session.commit()
+    return user
+
+
+def auth_headers(user):
+    return {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+
+@pytest.fixture
+def admin(app):
+    return make_user('admin', is_admin=True)
+
+
+@pytest.fixture
+def user(app):
+    return make_user('bob')
+
+
+def make_assets(owner, count, **values):
+    assets = [
+        Asset(**{'user_id': owner.id, 'name': f'asset {i}', 'type': 'Автомобілі', 'description': 'test',
+                 'price_per_day': 10.0 + i, **values})
+        for i in range(count)
+    ]
+    _db.session.add_all(assets)
+    _db.session.commit()
+    return assets
+
+
+def make_rentals(renter, assets, start=None):
+    start = start or date.today()
+    rentals = [
+        Rental(user_id=renter.id, asset_id=asset.id, rental_date=start, end_date=start + timedelta(days=2),
+               total_cost=asset.price_per_day * 3, status='Активний')
+        for asset in assets
+    ]
+    _db.session.add_all(rentals)
+    _db.session.commit()
+    return rentals
+
+
+@pytest.fixture
+def statements(app):
+    """
+    SQL-запити, виконані під час тесту (текст кожного cursor.execute).
+    """
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    engine = _db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', record)
@@ -0,0 +1,72 @@
+"""
+Журнал змін: лише дописується, старі записи згортаються в архів і читаються з нього.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import AuditArchive, StatusHistory
+from app.utils.audit import AuditError, compact
+from tests.conftest import auth_headers, make_assets
+
+
+def _history(client, admin, count):
+    assets = make_assets(admin, count)
+    headers = auth_headers(admin)
+    for path in ('maintenance', 'available'):
+        client.post(f'/objects/bulk/{path}', json={'ids': [a.id for a in assets]}, headers=headers)
+    return assets
+
+
+def test_compact_archives_old_rows_and_archive_reads_them(client, db, admin):
+    asset, other = _history(client, admin, 2)
+    old = datetime(2024, 3, 10, 12, 0)
+    # Табличний UPDATE оминає заборону ORM: так записи «старіють» для тесту
+    db.session.execute(StatusHistory.__table__.update().values(changed_at=old))
+    db.session.commit()
+
+    assert compact(datetime.utcnow() - timedelta(days=1), batch_size=3) == {
+        'status_histories': 4, 'rental_histories': 0}
+    assert StatusHistory.query.count() == 0
+    # Блок на об'єкт за місяць у кожній пачці: 3 + 1 рядки дають три блоки
+    assert AuditArchive.query.filter_by(source='status_histories').count() == 3
+
+    headers = auth_headers(admin)
+    rows = client.get(f'/status_history/asset/{asset.id}/archive', headers=headers).get_json()
+    assert [(r['previous_status'], r['new_status']) for r in rows] == [
+        ('Доступно', 'На обслуговуванні'), ('На обслуговуванні', 'Доступно')]
+    assert all(r['asset_id'] == asset.id for r in rows)
+    # Історія другого об'єкта лежить у двох блоках — читається разом, за порядком id
+    rows = client.get(f'/status_history/asset/{other.id}/archive', headers=headers).get_json()
+    assert [r['new_status'] for r in rows] == ['На обслуговуванні', 'Доступно']
+
+    query = {'from': '2024-04-01'}
+    assert client.get(f'/status_history/asset/{asset.id}/archive', query_string=query, headers=headers).get_json() == []
+    assert client.get(f'/status_history/asset/{asset.id}', headers=headers).get_json() == []
+
+
+def test_compact_keeps_recent_rows(client, db, admin):
+    _history(client, admin, 1)
+    assert compact(datetime.utcnow() - timedelta(days=1)) == {'status_histories': 0, 'rental_histories': 0}
+    assert StatusHistory.query.count() == 2
+
+
+@pytest.mark.parametrize('change', [
+    lambda db, row: setattr(row, 'new_status', 'Зайнято'),
+    lambda db, row: db.session.delete(row),
+])
+def test_history_is_append_only(client, db, admin, change):
+    _history(client, admin, 1)
+    row = StatusHistory.query.first()
+    change(db, row)
+    with pytest.raises(AuditError):
+        db.session.commit()
+    db.session.rollback()
+    assert StatusHistory.query.count() == 2
+
+
+def test_modify_returns_405_with_allow(client, admin):
+    _history(client, admin, 1)
+    response = client.put('/status_history/1', json={}, headers=auth_headers(admin))
+    assert response.status_code == 405
+    assert 'GET' in response.headers['Allow']
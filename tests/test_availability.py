@@ -0,0 +1,58 @@
+"""
+Пошук вільних об'єктів на [from, to): перетин, сусідні інтервали, скасування, тип.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from tests.conftest import auth_headers, make_assets, make_rentals
+
+
+def _free(client, user, start, end, **params):
+    query = dict(params, **{'from': start.isoformat(), 'to': end.isoformat()})
+    response = client.get('/objects/availability', query_string=query, headers=auth_headers(user))
+    assert response.status_code == 200
+    return [asset['id'] for asset in response.get_json()]
+
+
+def test_overlapping_vs_adjacent(client, admin, user):
+    busy, free = make_assets(admin, 2)
+    today = date.today()
+    make_rentals(user, [busy], start=today)  # [today, today + 2)
+
+    assert _free(client, user, today + timedelta(days=1), today + timedelta(days=3)) == [free.id]
+    assert _free(client, user, today - timedelta(days=1), today + timedelta(days=1)) == [free.id]
+    # Інтервали напіввідкриті: кінець оренди — вже вільний день
+    assert _free(client, user, today + timedelta(days=2), today + timedelta(days=4)) == [busy.id, free.id]
+    assert _free(client, user, today - timedelta(days=2), today) == [busy.id, free.id]
+
+
+def test_canceled_rental_frees_asset(client, admin, user):
+    asset, = make_assets(admin, 1)
+    rental, = make_rentals(user, [asset])
+    start, end = rental.rental_date, rental.end_date
+    assert _free(client, user, start, end) == []
+
+    assert client.post(f'/rentals/{rental.id}/cancel', headers=auth_headers(user)).status_code == 200
+    assert _free(client, user, start, end) == [asset.id]
+
+
+def test_type_filter(client, admin, user):
+    car, = make_assets(admin, 1)
+    bike, = make_assets(admin, 1, type='Велосипеди')
+    start = date.today()
+    end = start + timedelta(days=1)
+    assert _free(client, user, start, end, type='Велосипеди') == [bike.id]
+    assert _free(client, user, start, end, type='Автомобілі') == [car.id]
+
+
+@pytest.mark.parametrize('query', [
+    {},
+    {'from': '2024-01-01'},
+    {'from': '01.01.2024', 'to': '2024-01-05'},
+    {'from': '2024-01-05', 'to': '2024-01-05'},
+    {'from': '2024-01-05', 'to': '2024-01-01'},
+])
+def test_invalid_range(client, user, query):
+    response = client.get('/objects/availability', query_string=query, headers=auth_headers(user))
+    assert response.status_code == 400
@@ -0,0 +1,44 @@
+"""
+Бронювання: перетин інтервалів [start, end), сусідні інтервали, id рядком.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from tests.conftest import auth_headers, make_assets
+
+
+def _book(client, user, asset_id, start, days):
+    return client.post('/rentals/', headers=auth_headers(user), json={
+        'asset_id': asset_id,
+        'start_date': start.isoformat(),
+        'end_date': (start + timedelta(days=days)).isoformat(),
+    })
+
+
+def test_overlap_is_rejected(client, admin, user):
+    asset, = make_assets(admin, 1)
+    start = date.today() + timedelta(days=1)
+    assert _book(client, user, asset.id, start, 3).status_code == 201
+    response = _book(client, user, asset.id, start + timedelta(days=2), 3)
+    assert response.status_code == 409
+
+
+def test_adjacent_interval_is_accepted(client, admin, user):
+    asset, = make_assets(admin, 1)
+    start = date.today() + timedelta(days=1)
+    assert _book(client, user, asset.id, start, 3).status_code == 201
+    assert _book(client, user, asset.id, start + timedelta(days=3), 2).status_code == 201
+
+
+def test_asset_id_as_string(client, admin, user):
+    asset, = make_assets(admin, 1)
+    response = _book(client, user, str(asset.id), date.today() + timedelta(days=1), 2)
+    assert response.status_code == 201
+
+
+@pytest.mark.parametrize('asset_id', ['abc', '1.5', 1.5, True, [1]])
+def test_invalid_asset_id(client, admin, user, asset_id):
+    make_assets(admin, 1)
+    response = _book(client, user, asset_id, date.today() + timedelta(days=1), 2)
+    assert response.status_code == 400
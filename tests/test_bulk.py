@@ -0,0 +1,41 @@
+from app.models import Asset
+from tests.conftest import auth_headers, make_assets
+
+
+def _row(name, price=10):
+    return {'name': name, 'type': 'Велосипеди', 'price_per_day': price}
+
+
+def test_invalid_rows_are_reported_individually(client, db, admin):
+    rows = [_row('a'), _row('b'), {'name': {'x': 1}, 'type': 'Велосипеди', 'price_per_day': 1},
+            _row('d', 'nan'), _row('e', True), _row('f' * 101), _row('g', '12.5')]
+
+    response = client.post('/objects/bulk', json=rows, headers=auth_headers(admin))
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['inserted'] == 3
+    assert [e['row'] for e in body['errors']] == [3, 4, 5, 6]
+    assert body['errors'][0]['msg'] == "name must be a string"
+    assert sorted(name for name, in db.session.query(Asset.name)) == ['a', 'b', 'g']
+
+
+def test_failed_chunk_is_retried_row_by_row(client, db, admin):
+    db.session.execute(db.text(
+        "CREATE TRIGGER reject_boom BEFORE INSERT ON assets WHEN NEW.name = 'boom' "
+        "BEGIN SELECT RAISE(ABORT, 'boom'); END"))
+    db.session.commit()
+
+    response = client.post('/objects/bulk', json=[_row('a'), _row('boom'), _row('c')], headers=auth_headers(admin))
+
+    body = response.get_json()
+    assert body['inserted'] == 2
+    assert body['errors'] == [{'row': 2, 'msg': 'Could not insert row'}]
+
+
+def test_bool_ids_are_rejected(client, admin, user):
+    make_assets(admin, 1)
+    assert client.post('/objects/bulk/maintenance', json={'ids': [True]}, headers=auth_headers(admin)).status_code == 400
+    response = client.post('/rentals/batch', headers=auth_headers(user), json={
+        'asset_ids': [True], 'start_date': '2999-01-01', 'end_date': '2999-01-02'})
+    assert response.status_code == 400
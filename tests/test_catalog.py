@@ -0,0 +1,23 @@
+import pytest
+from sqlalchemy import inspect
+
+from tests.conftest import auth_headers, make_assets
+
+
+def test_fulltext_index_is_mysql_only(db):
+    names = {index['name'] for index in inspect(db.engine).get_indexes('assets')}
+    assert 'ix_assets_name_description_fulltext' not in names
+    assert 'ix_assets_type_price' in names
+
+
+@pytest.mark.parametrize('value', ['nan', 'inf', '-inf', 'abc'])
+def test_non_finite_price_filter_is_rejected(client, user, value):
+    response = client.get('/objects/', query_string={'max_price': value}, headers=auth_headers(user))
+    assert response.status_code == 400
+
+
+def test_price_and_text_filters(client, admin, user):
+    make_assets(admin, 5)
+    response = client.get('/objects/', query_string={'min_price': '11', 'max_price': '13', 'q': 'asset'},
+                          headers=auth_headers(user))
+    assert [asset['price_per_day'] for asset in response.get_json()] == [11.0, 12.0, 13.0]
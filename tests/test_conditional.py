@@ -0,0 +1,65 @@
+import pytest
+
+import config
+from app import create_app
+from app.extensions import db
+from app.models import User
+from app.utils.replicas import STICKY_COOKIE
+from tests.conftest import auth_headers, make_assets, make_rentals, make_user
+
+
+def test_if_none_match_returns_304(client, admin, user):
+    make_assets(admin, 2)
+    headers = auth_headers(user)
+    etag = client.get('/objects/', headers=headers).headers['ETag']
+
+    assert client.get('/objects/', headers={**headers, 'If-None-Match': etag}).status_code == 304
+
+
+def test_no_304_right_after_a_write(client, admin, user):
+    make_assets(admin, 2)
+    headers = auth_headers(user)
+    etag = client.get('/objects/', headers=headers).headers['ETag']
+
+    client.set_cookie(STICKY_COOKIE, '1')
+    assert client.get('/objects/', headers={**headers, 'If-None-Match': etag}).status_code == 200
+
+
+@pytest.fixture
+def workers(tmp_path, monkeypatch):
+    """
+    Два екземпляри застосунку над одним файлом БД — як два воркери gunicorn.
+    """
+    uri = f"sqlite:///{tmp_path / 'shared.db'}"
+    monkeypatch.setattr(config.Config, 'SQLALCHEMY_DATABASE_URI', uri)
+    monkeypatch.setattr(config.Config, 'SQLALCHEMY_ENGINE_OPTIONS', config.engine_options(uri))
+    apps = create_app(), create_app()
+    with apps[0].app_context():
+        db.create_all()
+        make_user('bob')
+        db.session.remove()
+    yield apps
+    for app in apps:
+        with app.app_context():
+            db.engine.dispose()
+
+
+def test_write_in_another_worker_changes_etag(workers):
+    reader, writer = workers
+    with reader.app_context():
+        user = User.query.filter_by(username='bob').one()
+        headers = auth_headers(user)
+        db.session.remove()
+    client = reader.test_client()
+    response = client.get('/rentals/', headers=headers)
+    etag = response.headers['ETag']
+    assert client.get('/rentals/', headers={**headers, 'If-None-Match': etag}).status_code == 304
+
+    with writer.app_context():
+        user = User.query.filter_by(username='bob').one()
+        make_rentals(user, make_assets(user, 1))
+        db.session.remove()
+
+    response = client.get('/rentals/', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert len(response.get_json()) == 1
@@ -0,0 +1,43 @@
+from datetime import date, datetime, timedelta
+
+from app.models import FinancialSummary, Rental
+from tests.conftest import auth_headers, make_assets, make_rentals
+
+
+def test_dashboard_counts_and_read_path_does_not_write(client, db, admin, user, statements):
+    rentals = make_rentals(user, make_assets(admin, 3))
+    db.session.get(Rental, rentals[0].id).status = 'Завершена'
+    db.session.commit()
+
+    del statements[:]
+    data = client.get('/dashboard/', headers=auth_headers(user)).get_json()
+
+    assert data['active_rentals_count'] == 2
+    assert data['completed_rentals_count'] == 1
+    assert not [s for s in statements if not s.lstrip().upper().startswith('SELECT')]
+
+
+def test_active_count_matches_active_list(client, db, admin, user):
+    rentals = make_rentals(user, make_assets(admin, 2))
+    headers = auth_headers(user)
+    client.post(f'/rentals/{rentals[0].id}/cancel', headers=headers)
+    # Статус, змінений поза API, теж видно одразу
+    db.session.get(Rental, rentals[1].id).status = 'Завершена'
+    db.session.commit()
+
+    data = client.get('/dashboard/', headers=headers).get_json()
+    assert data['active_rentals_count'] == len(data['active_rentals']) == 0
+    assert data['completed_rentals_count'] == 1
+
+
+def test_monthly_expenses_is_latest_summary_of_last_30_days(client, db, user):
+    now = datetime.utcnow()
+    db.session.add_all([
+        FinancialSummary(user_id=user.id, period_start=date(2020, 1, 1), period_end=date(2020, 1, 31),
+                         total_rentals=1, total_cost=10.0, created_at=now - timedelta(days=40)),
+        FinancialSummary(user_id=user.id, period_start=date(2020, 2, 1), period_end=date(2020, 2, 29),
+                         total_rentals=1, total_cost=25.0, created_at=now - timedelta(days=5)),
+    ])
+    db.session.commit()
+
+    assert client.get('/dashboard/', headers=auth_headers(user)).get_json()['monthly_expenses'] == 25.0
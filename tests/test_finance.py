@@ -0,0 +1,82 @@
+"""
+Фінансові підсумки: атомарний upsert при бронюванні, скасування адміністратором,
+унікальність періоду при PUT і звірка з rentals.
+"""
+from datetime import date, timedelta
+
+from app.models import FinancialSummary
+from app.utils.finance import month_bounds, reconcile_summaries
+from tests.conftest import auth_headers, make_assets, make_rentals
+
+
+def _start():
+    # Середина наступного місяця: обидві оренди потрапляють в один підсумок
+    return month_bounds(date.today())[1] + timedelta(days=10)
+
+
+def _summaries(db, user):
+    db.session.expire_all()
+    return FinancialSummary.query.filter_by(user_id=user.id).order_by(FinancialSummary.period_start).all()
+
+
+def test_bookings_accumulate_in_one_summary(client, db, admin, user):
+    assets = make_assets(admin, 3)
+    headers = auth_headers(user)
+    start = _start()
+    end = (start + timedelta(days=2)).isoformat()
+
+    for asset in assets[:1]:
+        assert client.post('/rentals/', headers=headers, json={
+            'asset_id': asset.id, 'start_date': start.isoformat(), 'end_date': end}).status_code == 201
+    assert client.post('/rentals/batch', headers=headers, json={
+        'asset_ids': [a.id for a in assets[1:]], 'start_date': start.isoformat(), 'end_date': end}).status_code == 201
+
+    summary, = _summaries(db, user)
+    assert summary.period_start == start.replace(day=1)
+    assert summary.total_rentals == 3
+    assert summary.total_cost == sum(a.price_per_day * 2 for a in assets)
+
+
+def test_admin_cancel_updates_renters_summary(client, db, admin, user):
+    asset, = make_assets(admin, 1)
+    start = _start()
+    response = client.post('/rentals/', headers=auth_headers(user), json={
+        'asset_id': asset.id, 'start_date': start.isoformat(), 'end_date': (start + timedelta(days=2)).isoformat()})
+    rental_id = response.get_json()['rental_id']
+
+    assert client.post(f'/rentals/{rental_id}/cancel', headers=auth_headers(admin)).status_code == 200
+
+    summary, = _summaries(db, user)
+    assert (summary.total_rentals, summary.total_cost) == (0, 0.0)
+    assert _summaries(db, admin) == []
+
+
+def test_put_onto_existing_period_is_conflict(client, db, user):
+    headers = auth_headers(user)
+    for month in (1, 2):
+        assert client.post('/financial_summary/', headers=headers, json={
+            'period_start': f'2024-0{month}-01', 'period_end': f'2024-0{month}-28',
+            'total_rentals': 1, 'total_cost': 10.0}).status_code == 201
+    first, second = _summaries(db, user)
+
+    response = client.put(f'/financial_summary/{second.id}', headers=headers, json={'period_start': '2024-01-01'})
+    assert response.status_code == 409
+    assert _summaries(db, user)[1].period_start == date(2024, 2, 1)
+
+
+def test_reconcile_reports_and_fixes_drift(db, admin, user):
+    assets = make_assets(admin, 2)
+    start = date(2024, 3, 5)
+    rentals = make_rentals(user, assets, start=start)
+    db.session.add(FinancialSummary(user_id=user.id, period_start=date(2024, 3, 1), period_end=date(2024, 3, 31),
+                                    total_rentals=1, total_cost=1.0))
+    db.session.add(FinancialSummary(user_id=user.id, period_start=date(2024, 4, 1), period_end=date(2024, 4, 30),
+                                    total_rentals=2, total_cost=5.0))
+    db.session.commit()
+    expected_cost = sum(r.total_cost for r in rentals)
+
+    drift = reconcile_summaries()
+    assert [(d[1], d[3]) for d in drift] == [(date(2024, 3, 1), (2, expected_cost)), (date(2024, 4, 1), (0, 0.0))]
+
+    assert len(reconcile_summaries(fix=True)) == 2
+    assert reconcile_summaries() == []
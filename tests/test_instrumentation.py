@@ -0,0 +1,54 @@
+"""
+Метрики запитів: потокові відповіді і SQL, що завершився помилкою.
+"""
+import pytest
+from flask import g
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from app.utils.instrumentation import request_sql_statements, response_bytes
+from tests.conftest import auth_headers, make_assets
+
+
+def _series(histogram, endpoint, suffix):
+    return sum(value for name, labels, value in histogram.samples()
+               if name.endswith(suffix) and labels.get('endpoint') == endpoint)
+
+
+def test_streamed_response_is_counted(app, client, admin):
+    make_assets(admin, 3)
+    count_before = _series(response_bytes, 'objects.get_assets', '_count')
+    bytes_before = _series(response_bytes, 'objects.get_assets', '_sum')
+    statements_before = _series(request_sql_statements, 'objects.get_assets', '_sum')
+
+    response = client.get('/objects/?stream=1', headers=auth_headers(admin))
+    body = response.get_data()
+    response.close()
+
+    assert len(response.json) == 3
+    assert _series(response_bytes, 'objects.get_assets', '_count') == count_before + 1
+    assert _series(response_bytes, 'objects.get_assets', '_sum') == bytes_before + len(body)
+    # SQL генератора рахується разом із запитом
+    assert _series(request_sql_statements, 'objects.get_assets', '_sum') > statements_before
+
+
+def test_failed_statement_does_not_skew_timing(app, db):
+    failed = []
+
+    def remember(exception_context):
+        failed.append(exception_context.execution_context)
+
+    event.listen(db.engine, 'handle_error', remember)
+    try:
+        with app.test_request_context('/'):
+            with db.engine.connect() as conn:
+                with pytest.raises(OperationalError):
+                    conn.execute(text('SELECT * FROM missing_table'))
+                conn.execute(text('SELECT 1'))
+            assert g.sql_count == 1
+            assert 0 <= g.sql_seconds < 1
+    finally:
+        event.remove(db.engine, 'handle_error', remember)
+    # Час початку невдалого запиту лежить у його власному контексті, не на з'єднанні
+    context, = failed
+    assert hasattr(context, '_statement_started')
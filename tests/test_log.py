@@ -0,0 +1,39 @@
+"""
+Логування: профілі не потрапляють у лог на INFO, слухач черги переживає перезапуск.
+"""
+import logging
+
+from app.utils import log
+from tests.conftest import auth_headers
+
+
+class _Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_profile_is_not_logged_at_info(app, client, user, caplog):
+    caplog.set_level(logging.INFO)
+    for url in ('/auth/me', '/users/profile'):
+        assert client.get(url, headers=auth_headers(user)).status_code == 200
+    assert not [r for r in caplog.records if user.email in r.getMessage()]
+
+
+def test_read_endpoints_log_nothing_at_info(app, client, admin, caplog):
+    caplog.set_level(logging.INFO)
+    for url in ('/objects/', '/users/', '/dashboard/', '/rentals/'):
+        assert client.get(url, headers=auth_headers(admin)).status_code == 200
+    assert [r.getMessage() for r in caplog.records if r.name.startswith('app.routes') and r.levelno >= logging.INFO] == []
+
+
+def test_restarted_listener_delivers_records(app):
+    collect = _Collect()
+    log._listener.handlers = (collect,)
+    log.restart_listener()
+    logging.getLogger('tests.log').warning("after restart")
+    log.stop_listener()
+    assert collect.messages == ["after restart"]
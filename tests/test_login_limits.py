@@ -0,0 +1,53 @@
+"""
+Ліміт спроб входу: витрачають лише невдалі спроби, адреса клієнта — з
+X-Forwarded-For, якщо налаштовано ProxyFix.
+"""
+import pytest
+
+import config
+from app import create_app
+from app.extensions import db
+from tests.conftest import make_user
+
+
+def _login(client, password, ip='10.0.0.1', forwarded_for=None):
+    return client.post('/auth/login', json={'username': 'bob', 'password': password},
+                       headers={'X-Forwarded-For': forwarded_for} if forwarded_for else {}, environ_base={'REMOTE_ADDR': ip})
+
+
+@pytest.mark.parametrize('payload', [
+    {'username': 123, 'password': 'x'},
+    {'username': 'bob', 'password': ['x']},
+])
+def test_non_string_credentials_are_rejected(client, user, payload):
+    assert client.post('/auth/login', json=payload).status_code == 401
+
+
+def test_successful_logins_are_not_limited(app, client, user):
+    burst = app.config['LOGIN_USER_BURST']
+    for _ in range(burst * 2):
+        assert _login(client, 'secret').status_code == 200
+
+
+def test_failed_logins_are_limited(app, client, user):
+    for _ in range(app.config['LOGIN_USER_BURST']):
+        assert _login(client, 'wrong').status_code == 401
+    response = _login(client, 'wrong')
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+
+
+def test_client_address_from_forwarded_header(monkeypatch):
+    monkeypatch.setattr(config.Config, 'PROXY_FIX_X_FOR', 1)
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        make_user('bob')
+        client = app.test_client()
+        # Усі запити приходять з адреси проксі, клієнти розрізняються заголовком
+        for _ in range(app.config['LOGIN_USER_BURST']):
+            assert _login(client, 'wrong', ip='10.0.0.254', forwarded_for='203.0.113.1').status_code == 401
+        assert _login(client, 'wrong', ip='10.0.0.254', forwarded_for='203.0.113.1').status_code == 429
+        assert _login(client, 'secret', ip='10.0.0.254', forwarded_for='203.0.113.2').status_code == 200
+        db.session.remove()
+        db.drop_all()
@@ -0,0 +1,61 @@
+"""
+Keyset-пагінація: прохід сторінками, tie-breaker за id, with_total, курсори і limit.
+"""
+from app.utils.pagination import encode_cursor
+from tests.conftest import auth_headers, make_assets
+
+
+def _walk(client, headers, **params):
+    items, pages, after = [], 0, None
+    while True:
+        query = dict(params, after=after) if after else params
+        response = client.get('/objects/', query_string=query, headers=headers)
+        assert response.status_code == 200
+        items += response.get_json()
+        pages += 1
+        after = response.headers.get('X-Next-Cursor')
+        if not after:
+            return items, pages
+
+
+def test_walk_sorted_by_price_descending_with_ties(client, admin):
+    make_assets(admin, 3, price_per_day=20.0)
+    make_assets(admin, 4, price_per_day=10.0)
+    make_assets(admin, 2, price_per_day=30.0)
+
+    items, pages = _walk(client, auth_headers(admin), sort='-price_per_day', limit=2)
+
+    assert pages == 5
+    assert len({item['id'] for item in items}) == 9
+    keys = [(item['price_per_day'], item['id']) for item in items]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_with_total(client, admin):
+    make_assets(admin, 5)
+    response = client.get('/objects/', query_string={'limit': 2, 'with_total': 1}, headers=auth_headers(admin))
+    assert response.headers['X-Total-Count'] == '5'
+    assert len(response.get_json()) == 2
+    assert 'X-Total-Count' not in client.get('/objects/', query_string={'limit': 2}, headers=auth_headers(admin)).headers
+
+
+def test_bad_or_mismatched_cursor(client, admin):
+    make_assets(admin, 3)
+    headers = auth_headers(admin)
+    assert client.get('/objects/', query_string={'after': 'not-a-cursor'}, headers=headers).status_code == 400
+    # Курсор сортування за id не підходить до сортування за ціною (два стовпці)
+    query = {'after': encode_cursor([1]), 'sort': '-price_per_day'}
+    assert client.get('/objects/', query_string=query, headers=headers).status_code == 400
+    query = {'after': encode_cursor(['abc', 1]), 'sort': '-price_per_day'}
+    assert client.get('/objects/', query_string=query, headers=headers).status_code == 400
+
+
+def test_limit_is_clamped_and_validated(app, client, admin):
+    make_assets(admin, 5)
+    headers = auth_headers(admin)
+    app.config['PAGE_SIZE_MAX'] = 3
+    response = client.get('/objects/', query_string={'limit': 100}, headers=headers)
+    assert len(response.get_json()) == 3
+    assert response.headers['X-Next-Cursor']
+    for limit in ('0', '-1', 'abc'):
+        assert client.get('/objects/', query_string={'limit': limit}, headers=headers).status_code == 400
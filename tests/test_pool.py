@@ -0,0 +1,91 @@
+"""
+Стрес-тест пулу: потоків у кілька разів більше за pool_size + max_overflow,
+зайві чекають у черзі пулу — без помилок і тайм-аутів.
+"""
+import threading
+import time
+
+import pytest
+
+import config
+from app import create_app
+from app.extensions import db
+from app.models import Asset
+from app.utils.metrics import pool_checkout_seconds, pool_checkout_timeouts
+from tests.conftest import auth_headers, make_assets, make_user
+
+POOL_SIZE, MAX_OVERFLOW = 2, 2
+
+
+@pytest.fixture
+def pooled_app(tmp_path, monkeypatch):
+    uri = f"sqlite:///{tmp_path / 'pool.db'}"
+    monkeypatch.setattr(config.Config, 'SQLALCHEMY_DATABASE_URI', uri)
+    monkeypatch.setattr(config.Config, 'SQLALCHEMY_ENGINE_OPTIONS', dict(
+        config.engine_options(uri), pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW, pool_timeout=30))
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        make_assets(make_user('pool'), 20)
+        db.session.remove()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+def _total(samples, suffix):
+    return sum(value for name, _, value in samples if name.endswith(suffix))
+
+
+def test_pool_survives_oversubscription(pooled_app):
+    capacity = POOL_SIZE + MAX_OVERFLOW
+    threads_count, queries = capacity * 4, 20
+    checkouts_before = _total(pool_checkout_seconds.samples(), '_count')
+    timeouts_before = pool_checkout_timeouts.samples()[0][2]
+    results = {'ok': 0, 'errors': []}
+    peak = [0]
+    lock = threading.Lock()
+
+    def worker():
+        with pooled_app.app_context():
+            for _ in range(queries):
+                try:
+                    db.session.query(Asset.id).filter(Asset.status == 'Доступно').limit(10).all()
+                    with lock:
+                        peak[0] = max(peak[0], db.engine.pool.checkedout())
+                    time.sleep(0.002)  # з'єднання тримається, як під час обробки запиту
+                    db.session.commit()
+                    with lock:
+                        results['ok'] += 1
+                except Exception as e:
+                    db.session.rollback()
+                    with lock:
+                        results['errors'].append(e)
+            db.session.remove()
+
+    threads = [threading.Thread(target=worker) for _ in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results['errors'] == []
+    assert results['ok'] == threads_count * queries
+    assert pool_checkout_timeouts.samples()[0][2] == timeouts_before
+    assert 1 < peak[0] <= capacity
+    assert _total(pool_checkout_seconds.samples(), '_count') - checkouts_before >= threads_count
+    with pooled_app.app_context():
+        assert db.engine.pool.checkedout() == 0
+
+
+def test_metrics_requires_admin_or_scrape_token(app, client, admin, user):
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers=auth_headers(user)).status_code == 403
+
+    response = client.get('/metrics', headers=auth_headers(admin))
+    assert response.status_code == 200
+    assert 'db_pool_checkout_seconds' in response.get_data(as_text=True)
+
+    app.config['METRICS_TOKEN'] = 'scrape-secret'
+    assert client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code in (401, 422)
@@ -0,0 +1,19 @@
+"""
+Гарячі запити (app.commands.hot_queries) не повинні падати у повний перебір таблиці.
+"""
+from app.commands import check_query_plans
+from tests.conftest import make_assets, make_rentals
+
+
+def test_hot_queries_use_indexes(admin, user):
+    make_rentals(user, make_assets(admin, 20))
+
+    assert check_query_plans() == []
+
+
+def test_missing_index_is_reported(db, admin):
+    db.session.execute(db.text('DROP INDEX ix_rentals_user_id_status'))
+
+    failed = dict(check_query_plans())
+    assert 'dashboard: active rentals' in failed
+    assert any(line.startswith('SCAN') for line in failed['dashboard: active rentals'])
@@ -0,0 +1,67 @@
+"""
+Читання з репліки і read-your-writes: після запису GET іде на основну БД
+у будь-якому воркері, поки в клієнта є cookie primary_until.
+"""
+import pytest
+from sqlalchemy import create_engine
+
+import config
+from app import create_app
+from app.extensions import db
+from app.models import User
+from app.utils.replicas import STICKY_COOKIE
+from tests.conftest import auth_headers, make_user
+
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    primary, replica = (f"sqlite:///{tmp_path / name}" for name in ('primary.db', 'replica.db'))
+    monkeypatch.setattr(config.Config, 'SQLALCHEMY_DATABASE_URI', primary)
+    monkeypatch.setattr(config.Config, 'SQLALCHEMY_ENGINE_OPTIONS', config.engine_options(primary))
+    monkeypatch.setattr(config.Config, 'REPLICA_DATABASE_URIS', [replica])
+    # Репліка, що відстає: користувач уже є, нових об'єктів ще немає
+    engine = create_engine(replica)
+    db.metadata.create_all(engine)
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        admin = make_user('admin', is_admin=True)
+        with engine.begin() as conn:
+            conn.execute(User.__table__.insert(), [{c.name: getattr(admin, c.name) for c in User.__table__.columns}])
+        headers = auth_headers(admin)
+        db.session.remove()
+    yield headers
+    engine.dispose()
+
+
+def _worker():
+    """
+    Окремий екземпляр застосунку — як інший воркер gunicorn без спільної пам'яті.
+    """
+    return create_app().test_client()
+
+
+def test_get_reads_from_replica(databases):
+    client = _worker()
+    created = client.post('/objects/', headers=databases, json={'name': 'new', 'type': 'car', 'price_per_day': 10})
+    assert created.status_code == 201
+
+    fresh = _worker()
+    assert fresh.get(f"/objects/{created.json['id']}", headers=databases).status_code == 404
+
+
+def test_get_after_write_reads_from_primary(databases):
+    worker_a, worker_b = _worker(), _worker()
+    created = worker_a.post('/objects/', headers=databases, json={'name': 'new', 'type': 'car', 'price_per_day': 10})
+    assert created.status_code == 201
+    url = f"/objects/{created.json['id']}"
+
+    assert worker_a.get(url, headers=databases).status_code == 200
+    worker_b.set_cookie(STICKY_COOKIE, worker_a.get_cookie(STICKY_COOKIE).value)
+    assert worker_b.get(url, headers=databases).status_code == 200
+
+
+def test_failed_write_does_not_pin(databases):
+    client = _worker()
+    assert client.post('/objects/', headers=databases, json={'name': 'new'}).status_code == 400
+    assert client.get_cookie(STICKY_COOKIE) is None
@@ -0,0 +1,51 @@
+from datetime import date, timedelta
+
+from app.models import Rental
+from app.utils import reports
+from tests.conftest import auth_headers, make_assets, make_rentals
+
+
+def _book(client, headers, asset, start, days=2):
+    return client.post('/rentals/', headers=headers, json={
+        'asset_id': asset.id, 'start_date': start.isoformat(), 'end_date': (start + timedelta(days=days)).isoformat(),
+    })
+
+
+def _last_month():
+    return date.today().replace(day=1) - timedelta(days=1)
+
+
+def _report(client, headers):
+    query = {'granularity': 'month', 'from': _last_month().replace(day=1).isoformat(), 'to': date.today().isoformat()}
+    report = client.get('/financial_summary/report', query_string=query, headers=headers).get_json()
+    return [p['rentals'] for p in report['periods']]
+
+
+def test_booking_in_the_past_and_canceling_started_rental(client, db, admin, user):
+    asset, other = make_assets(admin, 2)
+    headers = auth_headers(user)
+    assert _book(client, headers, asset, date.today() - timedelta(days=1)).status_code == 201
+
+    rental = make_rentals(user, [other], start=date.today() - timedelta(days=1))[0]
+    assert client.post(f'/rentals/{rental.id}/cancel', headers=headers).status_code == 200
+    db.session.expire_all()
+    assert db.session.get(Rental, rental.id).status == 'Скасована'
+
+
+def test_closed_periods_follow_database_changes(client, db, admin, user):
+    assets = make_assets(admin, 3)
+    rental = make_rentals(user, assets[:1], start=_last_month())[0]
+    headers = auth_headers(user)
+
+    assert _report(client, headers) == [1, 0]
+    assert any(key[:3] == (user.id, 'month', _last_month().replace(day=1)) for key in reports._closed_periods._data)
+
+    # Запис в обхід API (як з іншого процесу) змінює відбиток
+    make_rentals(user, assets[1:2], start=_last_month())
+    assert _report(client, headers) == [2, 0]
+
+    assert client.post(f'/rentals/{rental.id}/cancel', headers=headers).status_code == 200
+    assert _report(client, headers) == [1, 0]
+
+    assert _book(client, headers, assets[2], date.today()).status_code == 201
+    assert _report(client, headers) == [1, 1]
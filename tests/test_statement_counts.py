@@ -0,0 +1,58 @@
+"""
+Кількість SQL-запитів на запит до списку не залежить від кількості рядків
+(регресія N+1 у лінивих зв'язках rental.asset / rental.user).
+"""
+import pytest
+
+from app.extensions import db
+from tests.conftest import auth_headers, make_assets, make_rentals
+
+# (url, хто запитує, максимум запитів: користувач + дані сторінки)
+LIST_ENDPOINTS = [
+    ('/rentals/', 'user', 4),
+    ('/rentals/', 'admin', 4),
+    ('/objects/', 'user', 4),
+    ('/users/', 'admin', 4),
+    ('/status_history/', 'admin', 4),
+    ('/dashboard/', 'user', 6),
+]
+
+
+def _seed(client, admin, user, count):
+    """
+    count об'єктів з орендами й історією статусів: обслуговування і назад —
+    два записи status_histories на об'єкт, статус знову 'Доступно'.
+    """
+    assets = make_assets(admin, count)
+    make_rentals(user, assets)
+    ids = [asset.id for asset in assets]
+    for path in ('maintenance', 'available'):
+        assert client.post(f'/objects/bulk/{path}', json={'ids': ids}, headers=auth_headers(admin)).status_code == 200
+
+
+def _count(client, statements, url, headers):
+    # Прогрів кешів після нових рядків (dashboard: доступні об'єкти)
+    client.get(url, headers=headers)
+    # Тест і запит ділять одну сесію: без expire_all користувач береться з identity map
+    db.session.expire_all()
+    del statements[:]
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    return len(statements), len(response.get_json())
+
+
+@pytest.mark.parametrize('url, who, limit', LIST_ENDPOINTS)
+def test_list_statement_count_is_constant(client, statements, admin, user, url, who, limit):
+    headers = auth_headers(admin if who == 'admin' else user)
+
+    _seed(client, admin, user, 3)
+    few, few_rows = _count(client, statements, url, headers)
+
+    _seed(client, admin, user, 30)
+    many, many_rows = _count(client, statements, url, headers)
+
+    if url not in ('/dashboard/', '/users/'):
+        # Порівнюються непорожні сторінки різного розміру
+        assert 0 < few_rows < many_rows
+    assert few == many
+    assert many <= limit, statements
@@ -0,0 +1,22 @@
+import pytest
+
+from tests.conftest import auth_headers, make_assets
+
+
+@pytest.mark.parametrize('url', ['/status_history/', '/status_history/asset/1', '/status_history/asset/1/archive'])
+def test_bad_date_is_a_date_error(client, admin, url):
+    make_assets(admin, 1)
+    response = client.get(url, query_string={'from': '31.01.2024'}, headers=auth_headers(admin))
+
+    assert response.status_code == 400
+    assert 'ISO 8601' in response.get_json()['msg']
+    assert 'cursor' not in response.get_json()['msg'].lower()
+
+
+def test_date_range_filters_the_listing(client, admin):
+    make_assets(admin, 1)
+    headers = auth_headers(admin)
+    client.post('/objects/bulk/maintenance', json={'ids': [1]}, headers=headers)
+
+    assert len(client.get('/status_history/', query_string={'from': '2000-01-01'}, headers=headers).get_json()) == 1
+    assert client.get('/status_history/', query_string={'to': '2000-01-01'}, headers=headers).get_json() == []
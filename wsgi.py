@@ -0,0 +1,25 @@
+"""
+Точка входу для продакшн-серверів. Застосунок створюється один раз під час
+імпорту, тож gunicorn із preload_app завантажує його до fork воркерів.
+
+    gunicorn -c gunicorn.conf.py wsgi:app      # Linux / macOS
+    python wsgi.py                             # Windows: waitress
+"""
+import os
+
+from app import create_app
+
+app = create_app()
+
+
+if __name__ == '__main__':
+    from waitress import serve
+
+    serve(
+        app,
+        host=os.environ.get('HOST', '0.0.0.0'),
+        port=int(os.environ.get('PORT', 8000)),
+        threads=int(os.environ.get('WAITRESS_THREADS', (os.cpu_count() or 1) * 4)),
+        connection_limit=int(os.environ.get('WAITRESS_CONNECTION_LIMIT', 1000)),
+        channel_timeout=int(os.environ.get('WAITRESS_CHANNEL_TIMEOUT', 30)),
+    )